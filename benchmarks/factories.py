@@ -0,0 +1,64 @@
+from datetime import timedelta, timezone
+from functools import lru_cache
+
+import factory
+
+from src.models import (
+    LabelModel,
+    TaskModel,
+    TaskStates,
+    UserModel,
+    current_datetime,
+)
+from src.security import get_password_hash
+
+PASSWORD = 'benchmark-password'
+
+
+@lru_cache(maxsize=1)
+def password_hash() -> str:
+    # Argon2 is deliberately slow, so every seeded user shares one hash.
+    return get_password_hash(PASSWORD)
+
+
+class UserFactory(factory.Factory):
+    class Meta:
+        model = UserModel
+
+    id = factory.Faker('uuid4')
+    username = factory.Sequence(lambda n: f'benchmark-{n}')
+    email = factory.LazyAttribute(lambda user: f'{user.username}@example.com')
+    password_hash = factory.LazyFunction(password_hash)
+    updated_at = factory.LazyFunction(current_datetime)
+    created_at = factory.SelfAttribute('updated_at')
+
+
+class LabelFactory(factory.Factory):
+    class Meta:
+        model = LabelModel
+
+    title = factory.Faker('word')
+    color = factory.Faker('hex_color')
+    priority = factory.Faker('random_int', min=1, max=10)
+    updated_at = factory.LazyFunction(current_datetime)
+    created_at = factory.SelfAttribute('updated_at')
+
+
+class TaskFactory(factory.Factory):
+    class Meta:
+        model = TaskModel
+
+    title = factory.Faker('sentence', nb_words=4)
+    description = factory.Faker('text', max_nb_chars=200)
+    status = factory.Faker(
+        'random_element',
+        elements=[TaskStates.PENDING, TaskStates.DOING, TaskStates.DONE],
+    )
+    expires_at = factory.Faker(
+        'date_time_between',
+        start_date='-7d',
+        end_date='+30d',
+        tzinfo=timezone(timedelta(hours=-3)),
+    )
+    updated_at = factory.LazyFunction(current_datetime)
+    created_at = factory.SelfAttribute('updated_at')
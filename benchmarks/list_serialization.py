@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+import timeit
+from datetime import datetime, timedelta, timezone
+
+os.environ['DATABASE_URL'] = (
+    f'sqlite:///{tempfile.mkdtemp()}/list_serialization.sqlite'
+)
+os.environ.setdefault('ACCESS_TOKEN_KEY', 'benchmark-access-token-key')
+os.environ.setdefault('REFRESH_TOKEN_KEY', 'benchmark-refresh-token-key')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('REFRESH_TOKEN_EXPIRE_MINUTES', '60')
+os.environ.setdefault('TOKEN_ALGORITHM', 'HS256')
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session, selectinload  # noqa: E402
+
+from src.main import app  # noqa: E402
+from src.models import (  # noqa: E402
+    Base,
+    LabelModel,
+    TaskModel,
+    TaskStates,
+    UserModel,
+)
+from src.schemas import TasksPublicSchema  # noqa: E402
+from src.security import create_token  # noqa: E402
+from src.serializers import TASK_COLUMNS, tasks_page_response  # noqa: E402
+from src.settings import reload_settings  # noqa: E402
+
+PAGE_SIZES = (10, 100, 1000)
+LABELS = 10
+REPEAT = 5
+
+
+def seed(engine):
+    current_datetime = datetime.now(timezone(timedelta(hours=-3)))
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.execute(
+            insert(UserModel),
+            [
+                {
+                    'id': 'benchmark',
+                    'username': 'benchmark',
+                    'email': 'benchmark@example.com',
+                    'password_hash': '',
+                    'updated_at': current_datetime,
+                    'created_at': current_datetime,
+                }
+            ],
+        )
+        session.execute(
+            insert(LabelModel),
+            [
+                {
+                    'title': f'Label {index}',
+                    'color': '#a1b2c3',
+                    'priority': index % 10 + 1,
+                    'user_id': 'benchmark',
+                    'updated_at': current_datetime,
+                    'created_at': current_datetime,
+                }
+                for index in range(LABELS)
+            ],
+        )
+        session.execute(
+            insert(TaskModel.__table__),
+            [
+                {
+                    'title': f'Task {index}',
+                    'description': 'Benchmark task description',
+                    'status': TaskStates.PENDING,
+                    'label_id': index % (LABELS + 1) or None,
+                    'user_id': 'benchmark',
+                    'expires_at': current_datetime + timedelta(days=1),
+                    'updated_at': current_datetime,
+                    'created_at': current_datetime,
+                }
+                for index in range(max(PAGE_SIZES))
+            ],
+        )
+        session.commit()
+
+
+def serialize_orm(tasks) -> bytes:
+    """What response_model plus JSONResponse do with a page of ORM rows."""
+    content = TasksPublicSchema.model_validate({
+        'tasks': tasks,
+        'next_cursor': None,
+    }).model_dump(mode='json')
+
+    return json.dumps(
+        content, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+def serialize_rows(rows) -> bytes:
+    return tasks_page_response(rows, None).body
+
+
+def measure(function, number: int) -> float:
+    timer = timeit.Timer(function)
+
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number * 1e3
+
+
+def main():
+    engine = create_engine(os.environ['DATABASE_URL'])
+    seed(engine)
+
+    token = create_token('access_token', {'sub': 'benchmark'}).token
+    headers = {'Authorization': f'Bearer {token}'}
+
+    print(
+        f'{"case":<24}{"rows":>6}{"orm":>12}{"rows path":>12}'
+        f'{"speedup":>10}'
+    )
+
+    with Session(engine) as session:
+        for page_size in PAGE_SIZES:
+            number = max(10_000 // page_size, 5)
+            tasks = session.scalars(
+                select(TaskModel)
+                .options(selectinload(TaskModel.label))
+                .order_by(TaskModel.id)
+                .limit(page_size)
+            ).all()
+            rows = session.execute(
+                select(*TASK_COLUMNS)
+                .outerjoin(LabelModel)
+                .order_by(TaskModel.id)
+                .limit(page_size)
+            ).all()
+
+            assert json.loads(serialize_orm(tasks)) == json.loads(
+                serialize_rows(rows)
+            )
+
+            report(
+                'serialize',
+                page_size,
+                measure(lambda: serialize_orm(tasks), number),
+                measure(lambda: serialize_rows(rows), number),
+            )
+
+    with TestClient(app) as client:
+        for page_size in PAGE_SIZES:
+            number = max(2_000 // page_size, 5)
+            url = f'/task/all?page_size={page_size}'
+            timings = []
+
+            for mode in ('orm', 'rows'):
+                os.environ['LIST_SERIALIZATION'] = mode
+                reload_settings()
+                timings.append(
+                    measure(lambda: client.get(url, headers=headers), number)
+                )
+
+            report('GET /task/all', page_size, *timings)
+
+
+def report(name: str, page_size: int, orm_ms: float, rows_ms: float):
+    print(
+        f'{name:<24}{page_size:>6}{orm_ms:>10.2f}ms{rows_ms:>10.2f}ms'
+        f'{orm_ms / rows_ms:>9.1f}x'
+    )
+
+
+if __name__ == '__main__':
+    main()
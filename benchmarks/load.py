@@ -0,0 +1,418 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from time import perf_counter
+
+os.environ['DATABASE_URL'] = f'sqlite:///{tempfile.mkdtemp()}/load.sqlite'
+os.environ.setdefault('ACCESS_TOKEN_KEY', 'benchmark-access-token-key')
+os.environ.setdefault('REFRESH_TOKEN_KEY', 'benchmark-refresh-token-key')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('REFRESH_TOKEN_EXPIRE_MINUTES', '60')
+os.environ.setdefault('TOKEN_ALGORITHM', 'HS256')
+# Every request comes from the same address and a handful of usernames, so
+# the login limits would leave POST /auth/login measuring 429s.
+os.environ.setdefault('LOGIN_ADDRESS_BURST', '0')
+os.environ.setdefault('LOGIN_USERNAME_BURST', '0')
+
+import factory.random  # noqa: E402
+import httpx  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.routing import APIRoute  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.factories import (  # noqa: E402
+    PASSWORD,
+    LabelFactory,
+    TaskFactory,
+    UserFactory,
+)
+from src.main import app  # noqa: E402
+from src.security import create_token  # noqa: E402
+from src.settings import get_settings  # noqa: E402
+
+BATCH_SIZE = 10
+
+
+@dataclass
+class SeededUser:
+    username: str
+    access_token: str
+    refresh_token: str
+    label_ids: list[int] = field(default_factory=list)
+    task_ids: list[int] = field(default_factory=list)
+    spare_label_ids: list[int] = field(default_factory=list)
+    spare_task_ids: list[int] = field(default_factory=list)
+
+    def headers(self, which_token: str = 'access_token') -> dict[str, str]:
+        return {'Authorization': f'Bearer {getattr(self, which_token)}'}
+
+
+@dataclass
+class Fixtures:
+    """Seeded rows, spread over the requests of every scenario.
+
+    Request ``index`` acts as user ``index % users``. Destructive routes
+    consume that user's spare rows, one slice per request, so no request
+    deletes a row another one still needs.
+    """
+
+    users: list[SeededUser]
+    disposable_users: list[SeededUser]
+    per_user: int
+    expires_at: str
+
+    def user(self, index: int) -> SeededUser:
+        return self.users[index % len(self.users)]
+
+    def spare_label_id(self, index: int) -> int:
+        return self.user(index).spare_label_ids[index // len(self.users)]
+
+    def spare_task_id(self, index: int) -> int:
+        return self.user(index).spare_task_ids[index // len(self.users)]
+
+    def spare_task_batch(self, index: int) -> list[int]:
+        start = self.per_user + index // len(self.users) * BATCH_SIZE
+
+        return self.user(index).spare_task_ids[start : start + BATCH_SIZE]
+
+    def task(self, index: int) -> dict:
+        return {
+            'title': f'Load test task {index}',
+            'expires_at': self.expires_at,
+        }
+
+
+def seed_users(
+    session: Session,
+    count: int,
+    labels: tuple[int, int],
+    tasks: tuple[int, int],
+) -> list[SeededUser]:
+    """Build users with ``(kept, spare)`` labels and tasks each."""
+    users = UserFactory.build_batch(count)
+    session.add_all(users)
+    session.flush()
+    seeded = []
+
+    for user in users:
+        user_labels = LabelFactory.build_batch(sum(labels), user_id=user.id)
+        session.add_all(user_labels)
+        session.flush()
+
+        user_tasks = [
+            TaskFactory.build(
+                user_id=user.id,
+                label_id=user_labels[index % labels[0]].id
+                if labels[0] and index % 3
+                else None,
+            )
+            for index in range(sum(tasks))
+        ]
+        session.add_all(user_tasks)
+        session.flush()
+
+        seeded.append(
+            SeededUser(
+                username=user.username,
+                access_token=create_token(
+                    'access_token', {'sub': user.username}
+                ).token,
+                refresh_token=create_token(
+                    'refresh_token', {'sub': user.username}
+                ).token,
+                label_ids=[label.id for label in user_labels[: labels[0]]],
+                task_ids=[task.id for task in user_tasks[: tasks[0]]],
+                spare_label_ids=[
+                    label.id for label in user_labels[labels[0] :]
+                ],
+                spare_task_ids=[task.id for task in user_tasks[tasks[0] :]],
+            )
+        )
+
+    return seeded
+
+
+def seed(args: argparse.Namespace) -> Fixtures:
+    factory.random.reseed_random(args.seed)
+    engine = create_engine(get_settings().DATABASE_URL)
+    per_user = -(-args.requests // args.users)
+
+    with Session(engine, expire_on_commit=False) as session:
+        users = seed_users(
+            session,
+            args.users,
+            (max(args.labels, 1), per_user),
+            (max(args.tasks, BATCH_SIZE), per_user * (1 + BATCH_SIZE)),
+        )
+        disposable_users = seed_users(session, args.requests, (0, 0), (0, 0))
+        session.commit()
+
+    engine.dispose()
+
+    return Fixtures(
+        users=users,
+        disposable_users=disposable_users,
+        per_user=per_user,
+        expires_at=f'{(datetime.now() + timedelta(days=1)).isoformat()}-03:00',
+    )
+
+
+# Destructive scenarios run last, in this order, so that the rows the
+# earlier ones read are still there.
+SCENARIOS = {
+    'POST /auth/login': lambda fixtures, index: {
+        'data': {
+            'username': fixtures.user(index).username,
+            'password': PASSWORD,
+        },
+    },
+    # Refresh tokens are single use, so every request brings its own.
+    'POST /auth/refresh-token': lambda fixtures, index: {
+        'headers': {
+            'Authorization': 'Bearer '
+            + create_token(
+                'refresh_token', {'sub': fixtures.user(index).username}
+            ).token
+        },
+    },
+    'POST /user/': lambda fixtures, index: {
+        'json': {
+            'username': f'load-test-{index}',
+            'email': f'load-test-{index}@example.com',
+            'password': PASSWORD,
+        },
+    },
+    'GET /user/': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+    },
+    'PATCH /user/': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'json': {'email': f'load-test-{index}@example.org'},
+    },
+    'POST /label/': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'json': {'title': f'Label {index}', 'color': '#a1b2c3', 'priority': 5},
+    },
+    'GET /label/all': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+    },
+    'GET /label/{label_id}': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'path': {'label_id': fixtures.user(index).label_ids[0]},
+    },
+    'PATCH /label/{label_id}': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'path': {'label_id': fixtures.user(index).label_ids[0]},
+        'json': {'priority': index % 10 + 1},
+    },
+    'POST /task/': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'json': fixtures.task(index),
+    },
+    'POST /task/bulk': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'json': [fixtures.task(index)] * BATCH_SIZE,
+    },
+    'PATCH /task/bulk': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'json': [
+            {'id': task_id, 'status': 'doing'}
+            for task_id in fixtures.user(index).task_ids[:BATCH_SIZE]
+        ],
+    },
+    'POST /task/import': lambda fixtures, index: {
+        'headers': {
+            **fixtures.user(index).headers(),
+            'Content-Type': 'application/x-ndjson',
+        },
+        'content': '\n'.join([json.dumps(fixtures.task(index))] * BATCH_SIZE),
+    },
+    'GET /task/all': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+    },
+    'GET /task/export': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+    },
+    'GET /task/stats': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+    },
+    'GET /task/search': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'params': {'q': 'load test'},
+    },
+    'GET /task/{task_id}': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'path': {'task_id': fixtures.user(index).task_ids[0]},
+    },
+    'PATCH /task/{task_id}': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'path': {'task_id': fixtures.user(index).task_ids[0]},
+        'json': {'title': f'Updated task {index}'},
+    },
+    'DELETE /task/bulk': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'json': fixtures.spare_task_batch(index),
+    },
+    'DELETE /task/{task_id}': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'path': {'task_id': fixtures.spare_task_id(index)},
+    },
+    'DELETE /label/{label_id}': lambda fixtures, index: {
+        'headers': fixtures.user(index).headers(),
+        'path': {'label_id': fixtures.spare_label_id(index)},
+    },
+    'DELETE /user/': lambda fixtures, index: {
+        'headers': fixtures.disposable_users[index].headers(),
+    },
+}
+
+
+def api_routes() -> set[str]:
+    return {
+        f'{method} {route.path}'
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.endpoint.__module__.startswith('src.routers.')
+        for method in route.methods
+    }
+
+
+def percentile(samples: list[float], percent: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+
+    return statistics.quantiles(samples, n=100, method='inclusive')[
+        percent - 1
+    ]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: str,
+    fixtures: Fixtures,
+    args: argparse.Namespace,
+) -> dict:
+    method, path = scenario.split(' ', 1)
+    build = SCENARIOS[scenario]
+    indexes = iter(range(args.requests))
+    latencies, status_codes = [], Counter()
+
+    async def worker():
+        for index in indexes:
+            kwargs = build(fixtures, index)
+            url = path.format(**kwargs.pop('path', {}))
+            start = perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(perf_counter() - start)
+            status_codes[str(response.status_code)] += 1
+
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = perf_counter() - start
+
+    return {
+        'requests': len(latencies),
+        'status_codes': dict(sorted(status_codes.items())),
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies) * 1e3, 3),
+            'p50': round(percentile(latencies, 50) * 1e3, 3),
+            'p95': round(percentile(latencies, 95) * 1e3, 3),
+            'p99': round(percentile(latencies, 99) * 1e3, 3),
+        },
+    }
+
+
+async def run(args: argparse.Namespace, fixtures: Fixtures) -> dict:
+    results = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(
+            transport=transport, base_url='http://benchmark'
+        ) as client,
+    ):
+        for scenario in SCENARIOS:
+            results[scenario] = await run_scenario(
+                client, scenario, fixtures, args
+            )
+            print(
+                f'{scenario:<28}'
+                f'{results[scenario]["throughput_rps"]:>10.1f} req/s'
+                f'{results[scenario]["latency_ms"]["p50"]:>10.2f}ms p50'
+                f'{results[scenario]["latency_ms"]["p99"]:>10.2f}ms p99'
+                f'  {results[scenario]["status_codes"]}'
+            )
+
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Seed a SQLite database and load test every API route.'
+    )
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--labels', type=int, default=10, help='per user')
+    parser.add_argument('--tasks', type=int, default=100, help='per user')
+    parser.add_argument('--requests', type=int, default=200, help='per route')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark-results.json')
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    missing = api_routes() - SCENARIOS.keys()
+
+    if missing:
+        raise SystemExit(f'No load test scenario for: {", ".join(missing)}')
+
+    command.upgrade(Config('alembic.ini'), 'head')
+    fixtures = seed(args)
+    results = asyncio.run(run(args, fixtures))
+
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(
+            {
+                'commit': git_commit(),
+                'created_at': datetime.now().isoformat(),
+                'config': {
+                    **vars(args),
+                    'database_mode': get_settings().DATABASE_MODE,
+                },
+                'routes': results,
+            },
+            output,
+            indent=2,
+        )
+
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import timeit
+from datetime import datetime, timedelta, timezone
+
+ENV_FILE = """\
+DATABASE_URL="sqlite:///benchmark.sqlite"
+ACCESS_TOKEN_KEY="benchmark-access-token-key-0123456789"
+ACCESS_TOKEN_EXPIRE_MINUTES="30"
+REFRESH_TOKEN_KEY="benchmark-refresh-token-key-0123456789"
+REFRESH_TOKEN_EXPIRE_MINUTES="60"
+TOKEN_ALGORITHM="HS256"
+"""
+
+# Settings reads .env from the working directory, so run from a scratch
+# directory holding a realistic one.
+os.chdir(tempfile.mkdtemp())
+
+with open('.env', 'w', encoding='utf-8') as env_file:
+    env_file.write(ENV_FILE)
+
+import jwt  # noqa: E402
+
+from src.security import create_token, get_token_keys  # noqa: E402
+from src.settings import Settings  # noqa: E402
+
+NUMBER = 2000
+PAYLOAD = {'sub': 'benchmark'}
+DECODE_OPTIONS = {'required': ['sub', 'exp'], 'verify_exp': False}
+
+
+def create_token_uncached():
+    key = Settings().ACCESS_TOKEN_KEY  # type:ignore
+    expire = datetime.now(timezone(timedelta(hours=-3))) + timedelta(
+        minutes=Settings().ACCESS_TOKEN_EXPIRE_MINUTES  # type:ignore
+    )
+    to_encode = {**PAYLOAD, 'exp': expire.timestamp()}
+
+    return jwt.encode(to_encode, key, Settings().TOKEN_ALGORITHM)  # type:ignore
+
+
+def decode_token_uncached(token: str):
+    return jwt.decode(
+        jwt=token,
+        key=Settings().ACCESS_TOKEN_KEY,  # type:ignore
+        algorithms=[Settings().TOKEN_ALGORITHM],  # type:ignore
+        options=DECODE_OPTIONS,
+    )
+
+
+def decode_token_cached(token: str):
+    token_keys = get_token_keys('access_token')
+
+    return jwt.decode(
+        jwt=token,
+        key=token_keys.verifying_key,
+        algorithms=token_keys.algorithms,
+        options=DECODE_OPTIONS,
+    )
+
+
+def measure(function) -> float:
+    timer = timeit.Timer(function)
+
+    return min(timer.repeat(repeat=5, number=NUMBER)) / NUMBER * 1e6
+
+
+def main():
+    token = create_token('access_token', PAYLOAD).token
+    cases = [
+        (
+            'create_token',
+            create_token_uncached,
+            lambda: create_token('access_token', PAYLOAD),
+        ),
+        (
+            'get_current_user decode',
+            lambda: decode_token_uncached(token),
+            lambda: decode_token_cached(token),
+        ),
+    ]
+
+    print(f'{"operation":<26}{"before":>12}{"after":>12}{"speedup":>10}')
+
+    for name, before, after in cases:
+        before_us = measure(before)
+        after_us = measure(after)
+        print(
+            f'{name:<26}{before_us:>10.1f}us{after_us:>10.1f}us'
+            f'{before_us / after_us:>9.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
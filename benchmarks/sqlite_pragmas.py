@@ -0,0 +1,105 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+os.environ['DATABASE_URL'] = f'sqlite:///{tempfile.mkdtemp()}/pragmas.sqlite'
+os.environ.setdefault('ACCESS_TOKEN_KEY', 'benchmark-access-token-key')
+os.environ.setdefault('REFRESH_TOKEN_KEY', 'benchmark-refresh-token-key')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('REFRESH_TOKEN_EXPIRE_MINUTES', '60')
+os.environ.setdefault('TOKEN_ALGORITHM', 'HS256')
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from src.dependencies import engine_options, set_sqlite_pragmas  # noqa: E402
+from src.models import (  # noqa: E402
+    Base,
+    TaskModel,
+    TaskStates,
+    UserModel,
+    current_datetime,
+)
+from src.settings import Settings  # noqa: E402
+
+PROFILES = ('none', 'safe', 'wal')
+WRITERS = 8
+TRANSACTIONS = 250
+
+
+def write_tasks(engine, writer: int) -> int:
+    """Commit one task per transaction, as POST /task/ does."""
+    failures = 0
+
+    for index in range(TRANSACTIONS):
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    insert(TaskModel),
+                    {
+                        'title': f'Writer {writer} task {index}',
+                        'description': '',
+                        'status': TaskStates.PENDING,
+                        'expires_at': current_datetime(),
+                        'updated_at': current_datetime(),
+                        'created_at': current_datetime(),
+                        'user_id': 'benchmark',
+                    },
+                )
+
+        except OperationalError:
+            failures += 1
+
+    return failures
+
+
+def measure(profile: str) -> tuple[float, int]:
+    settings = Settings(  # type:ignore
+        DATABASE_URL=f'sqlite:///{tempfile.mkdtemp()}/{profile}.sqlite',
+        SQLITE_PRAGMA_PROFILE=profile,
+        DATABASE_POOL_SIZE=WRITERS,
+    )
+    engine = create_engine(settings.DATABASE_URL, **engine_options(settings))
+    set_sqlite_pragmas(engine, settings)
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(UserModel),
+            {
+                'id': 'benchmark',
+                'username': 'benchmark',
+                'email': 'benchmark@example.com',
+                'password_hash': '',
+                'updated_at': current_datetime(),
+                'created_at': current_datetime(),
+            },
+        )
+
+    start = perf_counter()
+
+    with ThreadPoolExecutor(WRITERS) as executor:
+        failures = sum(
+            executor.map(write_tasks, [engine] * WRITERS, range(WRITERS))
+        )
+
+    elapsed = perf_counter() - start
+    engine.dispose()
+
+    return (WRITERS * TRANSACTIONS - failures) / elapsed, failures
+
+
+def main():
+    print(
+        f'{WRITERS} writers x {TRANSACTIONS} transactions\n'
+        f'{"profile":<10}{"commits/s":>12}{"failures":>10}'
+    )
+
+    for profile in PROFILES:
+        throughput, failures = measure(profile)
+        print(f'{profile:<10}{throughput:>12.1f}{failures:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""create task counters table
+
+Revision ID: 1a6f0c8e2b95
+Revises: 5e9a7d3b1c64
+Create Date: 2026-10-18 18:41:36.290117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a6f0c8e2b95'
+down_revision: Union[str, None] = '5e9a7d3b1c64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INCREMENT = (
+    "INSERT INTO task_counters (user_id, status, label_id, count) "
+    "VALUES (new.user_id, new.status, coalesce(new.label_id, 0), 1) "
+    "ON CONFLICT (user_id, status, label_id) DO UPDATE SET count = count + 1; "
+)
+DECREMENT = (
+    "UPDATE task_counters SET count = count - 1 "
+    "WHERE user_id = old.user_id AND status = old.status "
+    "AND label_id = coalesce(old.label_id, 0); "
+)
+
+
+def require_sqlite() -> None:
+    # The triggers and the ON CONFLICT upsert are written in SQLite's dialect.
+    dialect = op.get_context().dialect.name
+
+    if dialect != 'sqlite':
+        raise NotImplementedError(
+            f'task_counters triggers are only written for SQLite, not '
+            f'{dialect}; port this migration before running it there'
+        )
+
+
+def upgrade() -> None:
+    require_sqlite()
+    op.create_table('task_counters',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'DOING', 'DONE', 'EXPIRED', name='taskstates'), nullable=False),
+    sa.Column('label_id', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'status', 'label_id')
+    )
+    # Label deletion and user deletion reach tasks through the foreign key
+    # actions, which fire these triggers as well.
+    op.execute(
+        "CREATE TRIGGER task_counters_after_insert AFTER INSERT ON tasks "
+        f"BEGIN {INCREMENT}END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_counters_after_delete AFTER DELETE ON tasks "
+        f"BEGIN {DECREMENT}END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_counters_after_update "
+        "AFTER UPDATE OF user_id, status, label_id ON tasks "
+        "WHEN old.user_id IS NOT new.user_id OR old.status IS NOT new.status "
+        "OR old.label_id IS NOT new.label_id "
+        f"BEGIN {DECREMENT}{INCREMENT}END"
+    )
+    op.execute(
+        "INSERT INTO task_counters (user_id, status, label_id, count) "
+        "SELECT user_id, status, coalesce(label_id, 0), count(*) FROM tasks "
+        "GROUP BY user_id, status, coalesce(label_id, 0)"
+    )
+
+
+def downgrade() -> None:
+    require_sqlite()
+    op.execute('DROP TRIGGER task_counters_after_update')
+    op.execute('DROP TRIGGER task_counters_after_delete')
+    op.execute('DROP TRIGGER task_counters_after_insert')
+    op.drop_table('task_counters')
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""drop tasks updated_at index
+
+Revision ID: 3c7f9e1a5b28
+Revises: 8d3c5f2a7e10
+Create Date: 2026-10-18 21:12:36.504817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7f9e1a5b28'
+down_revision: Union[str, None] = '8d3c5f2a7e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_tasks_user_id_updated_at', table_name='tasks')
+
+
+def downgrade() -> None:
+    op.create_index('ix_tasks_user_id_updated_at', 'tasks', ['user_id', 'updated_at', 'expires_at'], unique=False)
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""create query indexes
+
+Revision ID: 4f1d2b7c9a3e
+Revises: e3c88bd0768b
+Create Date: 2026-10-18 09:12:41.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1d2b7c9a3e'
+down_revision: Union[str, None] = 'e3c88bd0768b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_labels_user_id_priority', 'labels', ['user_id', 'priority'], unique=False)
+    op.create_index('ix_tasks_user_id_id', 'tasks', ['user_id', 'id'], unique=False)
+    op.create_index('ix_tasks_user_id_expires_at', 'tasks', ['user_id', 'expires_at'], unique=False)
+    op.create_index('ix_tasks_user_id_status', 'tasks', ['user_id', 'status'], unique=False)
+    op.create_index('ix_tasks_label_id', 'tasks', ['label_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_label_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_status', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_expires_at', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_id', table_name='tasks')
+    op.drop_index('ix_labels_user_id_priority', table_name='labels')
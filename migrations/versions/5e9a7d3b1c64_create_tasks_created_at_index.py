@@ -0,0 +1,26 @@
+"""create tasks created_at index
+
+Revision ID: 5e9a7d3b1c64
+Revises: c2a8e4f71d03
+Create Date: 2026-10-18 17:24:11.048392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a7d3b1c64'
+down_revision: Union[str, None] = 'c2a8e4f71d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_user_id_created_at', 'tasks', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_id_created_at', table_name='tasks')
\ No newline at end of file
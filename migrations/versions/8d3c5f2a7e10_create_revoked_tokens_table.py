@@ -0,0 +1,30 @@
+"""create revoked tokens table
+
+Revision ID: 8d3c5f2a7e10
+Revises: 1a6f0c8e2b95
+Create Date: 2026-10-18 20:05:47.613358
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3c5f2a7e10'
+down_revision: Union[str, None] = '1a6f0c8e2b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('revoked_tokens',
+    sa.Column('jti', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('jti')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('revoked_tokens')
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""create updated_at indexes
+
+Revision ID: 9b7e5c1d2f48
+Revises: 4f1d2b7c9a3e
+Create Date: 2026-10-18 14:37:09.218455
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b7e5c1d2f48'
+down_revision: Union[str, None] = '4f1d2b7c9a3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_labels_user_id_updated_at', 'labels', ['user_id', 'updated_at'], unique=False)
+    op.create_index('ix_tasks_user_id_updated_at', 'tasks', ['user_id', 'updated_at', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_id_updated_at', table_name='tasks')
+    op.drop_index('ix_labels_user_id_updated_at', table_name='labels')
@@ -0,0 +1,71 @@
+"""create tasks fts
+
+Revision ID: c2a8e4f71d03
+Revises: 9b7e5c1d2f48
+Create Date: 2026-10-18 16:02:53.771904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a8e4f71d03'
+down_revision: Union[str, None] = '9b7e5c1d2f48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def require_sqlite() -> None:
+    # FTS5 virtual tables and their triggers only exist in SQLite.
+    dialect = op.get_context().dialect.name
+
+    if dialect != 'sqlite':
+        raise NotImplementedError(
+            f'tasks_fts is an SQLite FTS5 index, not available on '
+            f'{dialect}; port this migration before running it there'
+        )
+
+
+def upgrade() -> None:
+    require_sqlite()
+    # External content table: the index stores only the tokens and reads
+    # title/description back from tasks, so the triggers must hand it the
+    # old values on every delete.
+    op.execute(
+        "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+        "title, description, content='tasks', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_after_insert AFTER INSERT ON tasks BEGIN "
+        "INSERT INTO tasks_fts (rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_after_delete AFTER DELETE ON tasks BEGIN "
+        "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_after_update "
+        "AFTER UPDATE OF title, description ON tasks BEGIN "
+        "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO tasks_fts (rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    op.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    require_sqlite()
+    op.execute('DROP TRIGGER tasks_fts_after_update')
+    op.execute('DROP TRIGGER tasks_fts_after_delete')
+    op.execute('DROP TRIGGER tasks_fts_after_insert')
+    op.execute('DROP TABLE tasks_fts')
@@ -0,0 +1,207 @@
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+os.environ['DATABASE_URL'] = (
+    f'sqlite:///{tempfile.mkdtemp()}/explain_query_plan.sqlite'
+)
+os.environ['DATABASE_MODE'] = 'sync'
+os.environ.setdefault('ACCESS_TOKEN_KEY', 'explain-query-plan-access-key')
+os.environ.setdefault('REFRESH_TOKEN_KEY', 'explain-query-plan-refresh-key')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('REFRESH_TOKEN_EXPIRE_MINUTES', '60')
+os.environ.setdefault('TOKEN_ALGORITHM', 'HS256')
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from src.dependencies import engine  # noqa: E402
+from src.main import app  # noqa: E402
+from src.security import create_token  # noqa: E402
+
+TASK_ORDERS = [
+    'task_id',
+    'task_title',
+    'task_description',
+    'task_status',
+    'task_expires_at',
+    'label_id',
+    'label_title',
+    'label_color',
+    'label_priority',
+]
+LABEL_ORDERS = ['id', 'title', 'color', 'priority', 'created_at']
+FULL_SCAN = re.compile(r'^SCAN (users|labels|tasks)\b')
+
+captured: dict[tuple, str] = {}
+current_route = ['']
+
+
+@event.listens_for(engine, 'before_cursor_execute')
+def capture_select(conn, cursor, statement, parameters, *args):
+    if statement.lstrip().upper().startswith('SELECT'):
+        captured.setdefault((statement, tuple(parameters)), current_route[0])
+
+
+def request(client: TestClient, route: str, method: str, url: str, **kwargs):
+    current_route[0] = route
+    return client.request(method, url, **kwargs)
+
+
+def drive_routes(client: TestClient):
+    request(
+        client,
+        'POST /user/',
+        'POST',
+        '/user/',
+        json={
+            'username': 'explain',
+            'email': 'explain@example.com',
+            'password': 'explain-password',
+        },
+    )
+    request(
+        client,
+        'POST /auth/login',
+        'POST',
+        '/auth/login',
+        data={'username': 'explain', 'password': 'explain-password'},
+    )
+    token = create_token('access_token', {'sub': 'explain'})
+    headers = {'Authorization': f'Bearer {token.token}'}
+
+    label = request(
+        client,
+        'POST /label/',
+        'POST',
+        '/label/',
+        headers=headers,
+        json={'title': 'explain', 'color': '#000000', 'priority': 1},
+    ).json()
+    expires_at = datetime.now() + timedelta(days=1)
+
+    for _ in range(2):
+        task = request(
+            client,
+            'POST /task/',
+            'POST',
+            '/task/',
+            headers=headers,
+            json={
+                'title': 'explain',
+                'expires_at': f'{expires_at.isoformat()}-03:00',
+                'label_id': label['id'],
+            },
+        ).json()
+
+    for route, orders in (
+        ('/task/all', TASK_ORDERS),
+        ('/label/all', LABEL_ORDERS),
+    ):
+        for column in orders:
+            for sort in ('asc', 'desc'):
+                url = f'{route}?order_by={column}-{sort}&page_size=1'
+                page = request(
+                    client, f'GET {route}', 'GET', url, headers=headers
+                )
+                cursor = page.is_success and page.json()['next_cursor']
+
+                if cursor:
+                    request(
+                        client,
+                        f'GET {route}',
+                        'GET',
+                        f'{url}&cursor={cursor}',
+                        headers=headers,
+                    )
+
+    for filters in (
+        'status=pending&status=expired',
+        f'label_id={label["id"]}&no_label=true',
+        f'expires_after={datetime.now().isoformat()}',
+        f'created_before={expires_at.isoformat()}&include_total=true',
+    ):
+        request(
+            client,
+            'GET /task/all',
+            'GET',
+            f'/task/all?{filters}',
+            headers=headers,
+        )
+
+    for route, fields in (
+        ('/task/all', 'id,title,status,expires_at'),
+        ('/label/all', 'id,title'),
+    ):
+        request(
+            client,
+            f'GET {route}',
+            'GET',
+            f'{route}?fields={fields}',
+            headers=headers,
+        )
+
+    request(client, 'GET /task/stats', 'GET', '/task/stats', headers=headers)
+    search = '/task/search?q=explain&page_size=1'
+    page = request(client, 'GET /task/search', 'GET', search, headers=headers)
+
+    if page.is_success and page.json()['next_cursor']:
+        request(
+            client,
+            'GET /task/search',
+            'GET',
+            f'{search}&cursor={page.json()["next_cursor"]}',
+            headers=headers,
+        )
+
+    request(
+        client,
+        'GET /task/{task_id}',
+        'GET',
+        f'/task/{task["id"]}',
+        headers=headers,
+    )
+    request(
+        client,
+        'GET /label/{label_id}',
+        'GET',
+        f'/label/{label["id"]}',
+        headers=headers,
+    )
+    request(client, 'GET /user/', 'GET', '/user/', headers=headers)
+
+
+def main() -> int:
+    command.upgrade(Config('alembic.ini'), 'head')
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        drive_routes(client)
+
+    full_scans = 0
+
+    with engine.connect() as conn:
+        for (statement, parameters), route in captured.items():
+            plan = conn.exec_driver_sql(
+                f'EXPLAIN QUERY PLAN {statement}', parameters
+            ).all()
+            details = [row[-1] for row in plan]
+            scans = [detail for detail in details if FULL_SCAN.match(detail)]
+            full_scans += len(scans)
+
+            print(f'[{"FULL SCAN" if scans else "OK"}] {route}')
+            print(f'    {" ".join(statement.split())}')
+
+            for detail in details:
+                print(f'      {detail}')
+
+    print(f'{len(captured)} queries, {full_scans} full table scans')
+
+    return 1 if full_scans else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
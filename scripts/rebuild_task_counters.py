@@ -0,0 +1,12 @@
+import asyncio
+
+from src.jobs import rebuild_task_counters
+
+
+def main():
+    rows = asyncio.run(rebuild_task_counters())
+    print(f'{rows} task counters rebuilt')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import math
+from collections.abc import Iterable
+from hashlib import blake2b
+from threading import Lock
+
+
+class BloomFilter:
+    """Thread-safe Bloom filter sized from its memory budget.
+
+    ``size_bytes`` fixes the memory footprint and ``error_rate`` the number
+    of hash functions; together they give the ``capacity`` up to which the
+    false-positive rate holds. Past it the filter keeps working, with more
+    false positives.
+    """
+
+    def __init__(self, size_bytes: int, error_rate: float):
+        self.size = max(size_bytes, 1) * 8
+        self.hashes = max(math.ceil(-math.log2(error_rate)), 1)
+        self.capacity = int(self.size * math.log(2) / self.hashes)
+        self.count = 0
+        self._bits = bytearray(self.size // 8)
+        self._lock = Lock()
+
+    def _positions(self, item: str):
+        # Double hashing: k positions out of the two halves of one digest.
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8])
+        second = int.from_bytes(digest[8:]) | 1
+
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, item: str) -> None:
+        with self._lock:
+            for position in self._positions(item):
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+            self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bits = bytearray(len(self._bits))
+            self.count = 0
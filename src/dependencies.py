@@ -1,28 +1,434 @@
-from datetime import datetime, timedelta, timezone
+from contextlib import asynccontextmanager
+from functools import partial
+from hashlib import blake2b
+from itertools import count
+from time import monotonic, time
 from typing import Annotated, Literal
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    CursorResult,
+    Engine,
+    Result,
+    create_engine,
+    event,
+    inspect,
+    make_url,
+    select,
+)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from src.cache import TTLCache
+from src.instrumentation import instrument_engine
 from src.models import UserModel
-from src.settings import Settings
+from src.security import get_token_keys
+from src.settings import Settings, get_settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login/')
-engine = create_engine(Settings().DATABASE_URL)  # type:ignore
 
 
-def get_session():
-    with Session(engine, autoflush=False, autocommit=False) as session:
+class ThreadpoolResult:
+    """Awaitable facade over an unbuffered ``Result``."""
+
+    def __init__(self, result: Result):
+        self.sync_result = result
+
+    async def partitions(self, size: int):
+        while rows := await run_in_threadpool(
+            self.sync_result.fetchmany, size
+        ):
+            yield rows
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_result.close)
+
+
+class ThreadpoolSession:
+    """Awaitable facade over a blocking ``Session``.
+
+    Implements the subset of the ``AsyncSession`` API used by the routers,
+    so the same ``async def`` routes run on the sync engine with every
+    database round trip pushed to the threadpool.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def _execute(self, *args, **kwargs):
+        # Buffer the rows like AsyncSession does, so iterating the result
+        # back on the event loop never touches the cursor.
+        result = self.sync_session.execute(*args, **kwargs)
+
+        if isinstance(result, CursorResult) and not result.returns_rows:
+            return result
+
+        return result.freeze()()
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, *args, **kwargs):
+        return await run_in_threadpool(partial(self._execute, *args, **kwargs))
+
+    async def stream(self, statement, *args, **kwargs) -> ThreadpoolResult:
+        # Unlike execute, rows stay on the cursor and are fetched from the
+        # threadpool one partition at a time.
+        result = await run_in_threadpool(
+            partial(
+                self.sync_session.execute,
+                statement.execution_options(stream_results=True),
+                *args,
+                **kwargs,
+            )
+        )
+
+        return ThreadpoolResult(result)
+
+    async def scalar(self, *args, **kwargs):
+        result = await self.execute(*args, **kwargs)
+        return result.scalar()
+
+    async def scalars(self, *args, **kwargs):
+        result = await self.execute(*args, **kwargs)
+        return result.scalars()
+
+    async def merge(self, instance, *args, **kwargs):
+        return await run_in_threadpool(
+            partial(self.sync_session.merge, instance, *args, **kwargs)
+        )
+
+    async def get(self, *args, **kwargs):
+        return await run_in_threadpool(
+            partial(self.sync_session.get, *args, **kwargs)
+        )
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def connection(self, *args, **kwargs):
+        return await run_in_threadpool(
+            partial(self.sync_session.connection, *args, **kwargs)
+        )
+
+    async def refresh(self, instance, *args, **kwargs) -> None:
+        await run_in_threadpool(
+            partial(self.sync_session.refresh, instance, *args, **kwargs)
+        )
+
+    async def flush(self, *args, **kwargs) -> None:
+        await run_in_threadpool(
+            partial(self.sync_session.flush, *args, **kwargs)
+        )
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+def get_async_database_url(settings: Settings, url: str | None = None):
+    if url is None and settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+
+    url = make_url(url or settings.DATABASE_URL)
+
+    if url.drivername == 'sqlite':
+        return url.set(drivername='sqlite+aiosqlite')
+
+    return url
+
+
+def engine_options(settings: Settings, url: str | None = None) -> dict:
+    options = {
+        'pool_recycle': settings.DATABASE_POOL_RECYCLE,
+        'pool_pre_ping': settings.DATABASE_POOL_PRE_PING,
+    }
+    url = make_url(url or settings.DATABASE_URL)
+
+    # In-memory SQLite gets a single-connection pool that takes no sizing.
+    if url.get_backend_name() != 'sqlite' or url.database not in {
+        None,
+        '',
+        ':memory:',
+    }:
+        options['pool_size'] = settings.DATABASE_POOL_SIZE
+        options['max_overflow'] = settings.DATABASE_MAX_OVERFLOW
+
+    return options
+
+
+def sqlite_pragmas(settings: Settings) -> dict[str, str | int]:
+    if settings.SQLITE_PRAGMA_PROFILE == 'none':
+        return {}
+
+    pragmas = {
+        'foreign_keys': 'ON',
+        'busy_timeout': settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+    if settings.SQLITE_PRAGMA_PROFILE == 'wal':
+        pragmas |= {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': settings.SQLITE_MMAP_SIZE,
+            'cache_size': settings.SQLITE_CACHE_SIZE,
+        }
+
+    return pragmas
+
+
+def set_sqlite_pragmas(engine: Engine, settings: Settings) -> None:
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = sqlite_pragmas(settings)
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+        cursor.close()
+
+
+def create_database_engine(settings: Settings, url: str | None = None):
+    if settings.DATABASE_MODE == 'async':
+        engine = create_async_engine(
+            get_async_database_url(settings, url),
+            **engine_options(settings, url),
+        )
+        sync_engine = engine.sync_engine
+
+    else:
+        engine = create_engine(
+            url or settings.DATABASE_URL, **engine_options(settings, url)
+        )
+        sync_engine = engine
+
+    instrument_engine(sync_engine)
+    set_sqlite_pragmas(sync_engine, settings)
+
+    return engine
+
+
+class ReplicaSet:
+    """Round-robin over read replica engines.
+
+    A replica that fails is ejected for ``eject_seconds`` and then simply
+    tried again by the next request that lands on it.
+    """
+
+    def __init__(self, engines: list, eject_seconds: float):
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * len(engines)
+        self._counter = count()
+
+    def choose(self) -> int | None:
+        now = monotonic()
+
+        for _ in self.engines:
+            index = next(self._counter) % len(self.engines)
+
+            if self._ejected_until[index] <= now:
+                return index
+
+        return None
+
+    def eject(self, index: int) -> None:
+        self._ejected_until[index] = monotonic() + self.eject_seconds
+
+
+engine = create_database_engine(get_settings())
+replicas = ReplicaSet(
+    [
+        create_database_engine(get_settings(), url)
+        for url in get_settings().READ_REPLICA_URLS
+    ],
+    get_settings().REPLICA_EJECT_SECONDS,
+)
+recent_writes = TTLCache(
+    maxsize=get_settings().READ_YOUR_WRITES_MAX_SIZE,
+    ttl=get_settings().READ_YOUR_WRITES_SECONDS,
+)
+
+
+@asynccontextmanager
+async def session_scope(bind=None):
+    """Open a session on the primary, or on ``bind`` when given."""
+    bind = engine if bind is None else bind
+
+    if get_settings().DATABASE_MODE == 'async':
+        async with AsyncSession(
+            bind, autoflush=False, autocommit=False, expire_on_commit=False
+        ) as session:
+            yield session
+
+    else:
+        session = ThreadpoolSession(
+            Session(
+                bind,
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+            )
+        )
+
+        try:
+            yield session
+
+        finally:
+            await session.close()
+
+
+def pin_to_primary(subject: str) -> None:
+    """Send ``subject``'s reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    recent_writes.set(subject, True)
+
+
+def request_subject(request: Request) -> str | None:
+    # The window follows the token's subject rather than the raw header, so
+    # a token issued right after a write is pinned as well.
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+
+    if scheme.lower() != 'bearer' or not token:
+        return None
+
+    try:
+        return verify_token(token, 'access_token')[0]
+
+    except jwt.PyJWTError:
+        return None
+
+
+def use_replica(request: Request) -> bool:
+    # Safe requests read from a replica unless the same user wrote within
+    # READ_YOUR_WRITES_SECONDS; anything else marks the user as a writer.
+    if not replicas.engines:
+        return False
+
+    subject = request_subject(request)
+
+    if request.method not in {'GET', 'HEAD', 'OPTIONS'}:
+        if subject:
+            pin_to_primary(subject)
+
+        return False
+
+    return subject is None or recent_writes.get(subject) is None
+
+
+async def get_session(request: Request):
+    replica = replicas.choose() if use_replica(request) else None
+
+    if replica is not None:
+        async with session_scope(replicas.engines[replica]) as session:
+            # Checking out a connection first lets a read fall back to the
+            # primary when the replica is down; failures after that, in the
+            # middle of the route's queries, still surface as errors.
+            try:
+                await session.connection()
+
+            except OperationalError:
+                replicas.eject(replica)
+
+            else:
+                try:
+                    yield session
+
+                except OperationalError:
+                    replicas.eject(replica)
+                    raise
+
+                return
+
+    async with session_scope() as session:
         yield session
 
 
+user_cache = TTLCache(
+    maxsize=get_settings().USER_CACHE_MAX_SIZE,
+    ttl=min(
+        get_settings().USER_CACHE_TTL_SECONDS,
+        get_settings().ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    ),
+)
+
+# Verified (username, exp, jti) claims by token digest. Entries live until the
+# token's exp, and the longest token lifetime bounds every entry.
+token_cache = TTLCache(
+    maxsize=get_settings().TOKEN_CACHE_MAX_SIZE,
+    ttl=max(
+        get_settings().ACCESS_TOKEN_EXPIRE_MINUTES,
+        get_settings().REFRESH_TOKEN_EXPIRE_MINUTES,
+    )
+    * 60,
+)
+
+
+def verify_token(
+    token: str, which_token: Literal['access_token', 'refresh_token']
+) -> tuple:
+    """Return the token's ``(sub, exp, jti)``, decoding it on a cache miss.
+
+    Raises ``jwt.PyJWTError`` for tokens that fail verification; those are
+    never cached.
+    """
+    key = (which_token, blake2b(token.encode(), digest_size=16).digest())
+    claims = token_cache.get(key)
+
+    if claims is None:
+        token_keys = get_token_keys(which_token)
+        payload = jwt.decode(
+            jwt=token,
+            key=token_keys.verifying_key,
+            algorithms=token_keys.algorithms,
+            options={
+                'required': ['sub', 'exp'],
+                'verify_exp': False,
+            },
+        )
+        claims = (
+            payload.get('sub'),
+            payload.get('exp', 0),
+            payload.get('jti'),
+        )
+        token_cache.set(
+            key, claims, ttl=min(claims[1] - time(), token_cache.ttl)
+        )
+
+    return claims
+
+
+def detached_copy(instance):
+    mapper = inspect(instance).mapper
+    copy = mapper.class_(**{
+        column.key: getattr(instance, column.key)
+        for column in mapper.column_attrs
+    })
+    make_transient_to_detached(copy)
+
+    return copy
+
+
 def get_current_user(which_token: Literal['access_token', 'refresh_token']):
-    def inner(
+    async def inner(
         token: Annotated[str, Depends(oauth2_scheme)],
-        session: Annotated[Session, Depends(get_session)],
+        session: Annotated[AsyncSession, Depends(get_session)],
     ):
         credentials_exception = HTTPException(
             status.HTTP_401_UNAUTHORIZED,
@@ -31,38 +437,20 @@ def get_current_user(which_token: Literal['access_token', 'refresh_token']):
         )
 
         try:
-            if which_token == 'access_token':
-                payload = jwt.decode(
-                    jwt=token,
-                    key=Settings().ACCESS_TOKEN_KEY,  # type:ignore
-                    algorithms=[Settings().TOKEN_ALGORITHM],  # type:ignore
-                    options={
-                        'required': ['sub', 'exp'],
-                        'verify_exp': False,
-                    },
-                )
+            username, expire, _ = verify_token(token, which_token)
 
-            elif which_token == 'refresh_token':
-                payload = jwt.decode(
-                    jwt=token,
-                    key=Settings().REFRESH_TOKEN_KEY,  # type:ignore
-                    algorithms=[Settings().TOKEN_ALGORITHM],  # type:ignore
-                    options={
-                        'required': ['sub', 'exp'],
-                        'verify_exp': False,
-                    },
-                )
+            if expire > time():
+                cached_user = user_cache.get(username)
 
-            username = payload.get('sub')
-            expire = payload.get('exp', 0)
-            current_datetime = datetime.now(timezone(timedelta(hours=-3)))
+                if cached_user is not None:
+                    return await session.merge(cached_user, load=False)
 
-            if expire > current_datetime.timestamp():
-                user = session.scalar(
+                user = await session.scalar(
                     select(UserModel).where(UserModel.username == username)
                 )
 
                 if user:
+                    user_cache.set(username, detached_copy(user))
                     return user
 
             raise credentials_exception
@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+
+from fastapi import Query
+from pydantic import Field
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.models import TaskModel, TaskStates, current_datetime
+from src.pagination import PageParams
+from src.serializers import LABEL_FIELDS, TASK_FIELDS
+
+
+def fields_pattern(names: tuple[str, ...]) -> str:
+    alternatives = '|'.join(names)
+
+    return rf'^(?:{alternatives})(?:,(?:{alternatives}))*$'
+
+
+def field_set(
+    fields: str | None, names: tuple[str, ...]
+) -> tuple[str, ...] | None:
+    # Canonical order, so every spelling of a field set shares one schema.
+    if fields is None:
+        return None
+
+    requested = set(fields.split(','))
+
+    return tuple(name for name in names if name in requested)
+
+
+def local_datetime(value: datetime) -> datetime:
+    # Stored datetimes carry no offset and are compared in UTC-3, like
+    # current_datetime(), so aware inputs are converted before binding.
+    if value.tzinfo is None:
+        return value
+
+    return value.astimezone(timezone(timedelta(hours=-3)))
+
+
+@dataclass
+class TaskListParams(PageParams):
+    """Pagination plus the query parameters narrowing ``/task/all``.
+
+    Values of the same parameter are ORed, different parameters are ANDed.
+    ``*_after`` bounds are inclusive and ``*_before`` bounds exclusive.
+    ``fields`` narrows the columns of each task instead of the rows.
+    """
+
+    status: Annotated[list[TaskStates] | None, Query()] = None
+    label_id: Annotated[list[Annotated[int, Field(gt=0)]] | None, Query()] = (
+        None
+    )
+    no_label: Annotated[bool, Query()] = False
+    expires_after: Annotated[datetime | None, Query()] = None
+    expires_before: Annotated[datetime | None, Query()] = None
+    created_after: Annotated[datetime | None, Query()] = None
+    created_before: Annotated[datetime | None, Query()] = None
+    include_total: Annotated[bool, Query()] = False
+    fields: Annotated[
+        str | None, Query(pattern=fields_pattern(TASK_FIELDS))
+    ] = None
+
+    def field_set(self) -> tuple[str, ...] | None:
+        return field_set(self.fields, TASK_FIELDS)
+
+    def status_clause(self) -> ColumnElement[bool]:
+        # Spelled out over the stored columns instead of current_status, so
+        # ix_tasks_user_id_status and ix_tasks_user_id_expires_at apply.
+        now = current_datetime()
+        states = set(self.status)
+        matches = []
+
+        if TaskStates.EXPIRED in states:
+            states.discard(TaskStates.EXPIRED)
+            matches.append(
+                or_(
+                    TaskModel.expires_at < now,
+                    TaskModel.status == TaskStates.EXPIRED,
+                )
+            )
+
+        if states:
+            matches.append(
+                and_(
+                    TaskModel.status.in_(states),
+                    TaskModel.expires_at >= now,
+                )
+            )
+
+        return or_(*matches)
+
+    def label_clause(self) -> ColumnElement[bool]:
+        matches = []
+
+        if self.label_id:
+            matches.append(TaskModel.label_id.in_(set(self.label_id)))
+
+        if self.no_label:
+            matches.append(TaskModel.label_id.is_(None))
+
+        return or_(*matches)
+
+    def clauses(self) -> list[ColumnElement[bool]]:
+        clauses = []
+
+        if self.status:
+            clauses.append(self.status_clause())
+
+        if self.label_id or self.no_label:
+            clauses.append(self.label_clause())
+
+        for column, after, before in (
+            (TaskModel.expires_at, self.expires_after, self.expires_before),
+            (TaskModel.created_at, self.created_after, self.created_before),
+        ):
+            if after:
+                clauses.append(column >= local_datetime(after))
+
+            if before:
+                clauses.append(column < local_datetime(before))
+
+        return clauses
+
+
+@dataclass
+class LabelListParams(PageParams):
+    """Pagination plus the sparse fieldset of ``/label/all``."""
+
+    fields: Annotated[
+        str | None, Query(pattern=fields_pattern(LABEL_FIELDS))
+    ] = None
+
+    def field_set(self) -> tuple[str, ...] | None:
+        return field_set(self.fields, LABEL_FIELDS)
@@ -0,0 +1,114 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+
+CSV_MAX_RECORD_LENGTH = 64 * 1024
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, str]]:
+    """Yield numbered lines from a byte stream without buffering it whole."""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    pending = ''
+    line_number = 0
+
+    async for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split('\n')
+
+        for line in lines:
+            line_number += 1
+            yield line_number, line.removesuffix('\r')
+
+    pending += decoder.decode(b'', final=True)
+
+    if pending:
+        yield line_number + 1, pending.removesuffix('\r')
+
+
+async def ndjson_records(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    async for line_number, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+
+        except ValueError:
+            yield line_number, None, 'Invalid JSON'
+            continue
+
+        if isinstance(record, dict):
+            yield line_number, record, None
+
+        else:
+            yield line_number, None, 'Expected a JSON object'
+
+
+async def csv_records(
+    chunks: AsyncIterable[bytes],
+    max_record_length: int = CSV_MAX_RECORD_LENGTH,
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """Yield records keyed by the header row, numbered by their first line.
+
+    A quoted field may span lines, so lines are gathered until the quotes
+    balance before the record is parsed. A record that grows past
+    ``max_record_length`` characters, like one opened by a stray quote, is
+    rejected and parsing resumes on the next line.
+    """
+    header = None
+    record_lines: list[str] = []
+    record_length = 0
+    quoted = False
+    first_line = 0
+
+    async for line_number, line in iter_lines(chunks):
+        if not record_lines:
+            first_line = line_number
+
+            if not line.strip():
+                continue
+
+        record_lines.append(line)
+        record_length += len(line) + 1
+        # Escaped quotes come in pairs, so the parity of each line's count
+        # tells whether the record still ends inside a quoted field.
+        quoted ^= line.count('"') % 2 == 1
+
+        if record_length > max_record_length:
+            yield (
+                first_line,
+                None,
+                f'Record exceeds {max_record_length} characters',
+            )
+            record_lines, record_length, quoted = [], 0, False
+            continue
+
+        if quoted:
+            continue
+
+        try:
+            values = next(csv.reader(['\n'.join(record_lines)]))
+
+        except csv.Error:
+            values = None
+
+        record_lines, record_length = [], 0
+
+        if values is None:
+            yield first_line, None, 'Invalid CSV'
+
+        elif header is None:
+            header = [name.strip() for name in values]
+
+        elif len(values) != len(header):
+            yield first_line, None, f'Expected {len(header)} columns'
+
+        else:
+            yield first_line, dict(zip(header, values)), None
+
+    if record_lines:
+        yield first_line, None, 'Unterminated quoted field'
@@ -0,0 +1,106 @@
+import json
+import logging
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+
+@dataclass
+class QueryStats:
+    scope: Scope
+    count: int = 0
+    duration: float = 0.0
+
+    @property
+    def route(self) -> str:
+        return getattr(self.scope.get('route'), 'path', self.scope['path'])
+
+
+request_queries: ContextVar[QueryStats | None] = ContextVar(
+    'request_queries', default=None
+)
+
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape, so slow queries group together."""
+    statement = STRING_LITERAL.sub('?', ' '.join(statement.split()))
+    statement = NUMBER_LITERAL.sub('?', statement)
+
+    return PLACEHOLDER_LIST.sub('(?, ...)', statement)
+
+
+def before_cursor_execute(conn, *args):
+    conn.info.setdefault('query_start_time', []).append(perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, *args):
+    duration = perf_counter() - conn.info['query_start_time'].pop()
+    stats = request_queries.get()
+
+    if stats:
+        stats.count += 1
+        stats.duration += duration
+
+    if duration * 1000 >= get_settings().SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            json.dumps({
+                'event': 'slow_query',
+                'duration_ms': round(duration * 1000, 3),
+                'method': stats.scope['method'] if stats else None,
+                'route': stats.route if stats else None,
+                'statement': normalize_sql(statement),
+            })
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+
+class QueryTimingMiddleware:
+    """Counts the statements of each request and reports them.
+
+    The totals go out in a ``Server-Timing`` header, so streamed bodies
+    only account for the queries run before their first chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = request_queries.set(stats)
+
+        async def send_wrapper(message: Message):
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message).append(
+                    'Server-Timing',
+                    f'db;dur={stats.duration * 1000:.3f};'
+                    f'desc="statements: {stats.count}"',
+                )
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        finally:
+            request_queries.reset(token)
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+
+from sqlalchemy import delete, func, insert, select, update
+
+from src.dependencies import session_scope
+from src.models import (
+    TaskCounterModel,
+    TaskModel,
+    TaskStates,
+    current_datetime,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def expire_overdue_tasks() -> int:
+    async with session_scope() as session:
+        try:
+            result = await session.execute(
+                update(TaskModel)
+                .where(
+                    TaskModel.status != TaskStates.EXPIRED,
+                    TaskModel.expires_at < current_datetime(),
+                )
+                .values(status=TaskStates.EXPIRED)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        except Exception as error:
+            await session.rollback()
+            raise error
+
+    return result.rowcount
+
+
+async def rebuild_task_counters() -> int:
+    """Recount every user's tasks with one GROUP BY over tasks."""
+    label_id = func.coalesce(TaskModel.label_id, 0)
+
+    async with session_scope() as session:
+        try:
+            await session.execute(delete(TaskCounterModel))
+            result = await session.execute(
+                insert(TaskCounterModel).from_select(
+                    ['user_id', 'status', 'label_id', 'count'],
+                    select(
+                        TaskModel.user_id,
+                        TaskModel.status,
+                        label_id,
+                        func.count(),
+                    ).group_by(TaskModel.user_id, TaskModel.status, label_id),
+                )
+            )
+            await session.commit()
+
+        except Exception as error:
+            await session.rollback()
+            raise error
+
+    return result.rowcount
+
+
+async def expire_overdue_tasks_forever(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            await expire_overdue_tasks()
+
+        except Exception:
+            logger.exception('Failed to expire overdue tasks')
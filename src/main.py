@@ -1,9 +1,59 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from src.dependencies import engine
+from src.instrumentation import QueryTimingMiddleware
+from src.jobs import expire_overdue_tasks_forever
+from src.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
+from src.revocation import load_revoked_tokens
 from src.routers import auth, label, task, user
+from src.security import PasswordHashPoolFull, password_hash_pool
+from src.settings import get_settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await load_revoked_tokens()
+    expire_job = asyncio.create_task(
+        expire_overdue_tasks_forever(
+            get_settings().EXPIRE_TASKS_INTERVAL_SECONDS
+        )
+    )
+
+    yield
+
+    # Let the job unwind before the engine and hash pool go away under it.
+    expire_job.cancel()
+
+    with suppress(asyncio.CancelledError):
+        await expire_job
 
-app = FastAPI()
+    password_hash_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(auth.router)
 app.include_router(user.router)
 app.include_router(label.router)
 app.include_router(task.router)
+app.add_middleware(QueryTimingMiddleware)
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
+
+@app.exception_handler(PasswordHashPoolFull)
+def password_hash_pool_full(request: Request, error: PasswordHashPoolFull):
+    return JSONResponse(
+        content={'detail': 'Too many password operations, try again later'},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': '1'},
+    )
+
+
+@app.get('/metrics', include_in_schema=False)
+def show_metrics():
+    return PlainTextResponse(
+        metrics.render(engine.pool), media_type=CONTENT_TYPE
+    )
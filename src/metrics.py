@@ -0,0 +1,184 @@
+from bisect import bisect_left
+from collections import defaultdict
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy.pool import Pool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+
+def format_labels(**labels: str) -> str:
+    escaped = (
+        (
+            name,
+            value.replace('\\', r'\\')
+            .replace('"', r'\"')
+            .replace('\n', r'\n'),
+        )
+        for name, value in labels.items()
+    )
+
+    return ','.join(f'{name}="{value}"' for name, value in escaped)
+
+
+class MetricsRegistry:
+    """Request counters and latency histograms, keyed by route template."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = Lock()
+        self._requests: defaultdict[tuple, int] = defaultdict(int)
+        self._histograms: dict[tuple, list] = {}
+
+    def observe(
+        self, method: str, route: str, status_code: int, duration: float
+    ) -> None:
+        with self._lock:
+            self._requests[method, route, str(status_code)] += 1
+            histogram = self._histograms.setdefault(
+                (method, route), [[0] * (len(self.buckets) + 1), 0.0]
+            )
+            histogram[0][bisect_left(self.buckets, duration)] += 1
+            histogram[1] += duration
+
+    def clear(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._histograms.clear()
+
+    def render(self, pool: Pool | None = None) -> str:
+        with self._lock:
+            requests = sorted(self._requests.items())
+            histograms = sorted(
+                (key, (list(counts), total))
+                for key, (counts, total) in self._histograms.items()
+            )
+
+        lines = [
+            '# HELP http_requests_total Requests handled, by route template.',
+            '# TYPE http_requests_total counter',
+        ]
+
+        for (method, route, status_code), count in requests:
+            labels = format_labels(
+                method=method, route=route, status=status_code
+            )
+            lines.append(f'http_requests_total{{{labels}}} {count}')
+
+        lines += [
+            '# HELP http_request_duration_seconds Request latency, by route '
+            'template.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+
+        for (method, route), (counts, total) in histograms:
+            labels = format_labels(method=method, route=route)
+            cumulative = 0
+
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},'
+                    f'le="{bound}"}} {cumulative}'
+                )
+
+            lines += [
+                f'http_request_duration_seconds_sum{{{labels}}} {total}',
+                f'http_request_duration_seconds_count{{{labels}}} '
+                f'{cumulative}',
+            ]
+
+        if pool is not None:
+            lines += pool_gauges(pool)
+
+        return '\n'.join(lines) + '\n'
+
+
+def pool_gauges(pool: Pool) -> list[str]:
+    # Only queue pools keep these counters; SQLite in-memory and NullPool
+    # setups simply report nothing. QueuePool.overflow() counts down from
+    # -pool_size until the pool is full, so it is clamped at zero.
+    gauges = (
+        ('db_pool_size', 'size', 'Connections the pool keeps open.'),
+        (
+            'db_pool_checked_out_connections',
+            'checkedout',
+            'Connections currently in use.',
+        ),
+        (
+            'db_pool_overflow',
+            'overflow',
+            'Connections opened beyond the pool size.',
+        ),
+    )
+    lines = []
+
+    for name, method, description in gauges:
+        if callable(getattr(pool, method, None)):
+            lines += [
+                f'# HELP {name} {description}',
+                f'# TYPE {name} gauge',
+                f'{name} {max(getattr(pool, method)(), 0)}',
+            ]
+
+    return lines
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and records it under its route template.
+
+    A plain ASGI middleware, so streamed responses are timed up to their
+    last chunk and nothing is buffered.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        finally:
+            # The router stores the matched route in the scope, which keeps
+            # raw ids out of the labels.
+            route = getattr(scope.get('route'), 'path', 'unmatched')
+            self.registry.observe(
+                scope['method'], route, status_code, perf_counter() - start
+            )
+
+
+metrics = MetricsRegistry()
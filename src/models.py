@@ -1,8 +1,30 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from enum import StrEnum
 
-from sqlalchemy import ForeignKey
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    bindparam,
+    case,
+    column,
+    table,
+    type_coerce,
+)
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    column_property,
+    mapped_column,
+    relationship,
+)
+
+
+def current_datetime() -> datetime:
+    return datetime.now(timezone(timedelta(hours=-3)))
 
 
 class Base(DeclarativeBase):
@@ -20,8 +42,19 @@ class UserModel(Base):
     created_at: Mapped[datetime] = mapped_column()
 
 
+class RevokedTokenModel(Base):
+    __tablename__ = 'revoked_tokens'
+
+    jti: Mapped[str] = mapped_column(primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(nullable=False)
+
+
 class LabelModel(Base):
     __tablename__ = 'labels'
+    __table_args__ = (
+        Index('ix_labels_user_id_priority', 'user_id', 'priority'),
+        Index('ix_labels_user_id_updated_at', 'user_id', 'updated_at'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(nullable=False)
@@ -43,6 +76,13 @@ class TaskStates(StrEnum):
 
 class TaskModel(Base):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        Index('ix_tasks_user_id_id', 'user_id', 'id'),
+        Index('ix_tasks_user_id_expires_at', 'user_id', 'expires_at'),
+        Index('ix_tasks_user_id_status', 'user_id', 'status'),
+        Index('ix_tasks_label_id', 'label_id'),
+        Index('ix_tasks_user_id_created_at', 'user_id', 'created_at'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(nullable=False)
@@ -58,3 +98,49 @@ class TaskModel(Base):
     label_id: Mapped[int | None] = mapped_column(
         ForeignKey('labels.id', ondelete='SET NULL'), nullable=True
     )
+    current_status: Mapped[TaskStates] = column_property(
+        type_coerce(
+            case(
+                (
+                    expires_at
+                    < bindparam(
+                        'current_datetime',
+                        callable_=current_datetime,
+                        type_=DateTime,
+                    ),
+                    TaskStates.EXPIRED.name,
+                ),
+                else_=status,
+            ),
+            Enum(TaskStates),
+        )
+    )
+
+
+class TaskCounterModel(Base):
+    """Tasks per user, stored status and label.
+
+    Maintained by the triggers of migration 1a6f0c8e2b95 in the same
+    transaction as every write to tasks. Label 0 stands for tasks without
+    a label, so the primary key never holds a NULL.
+    """
+
+    __tablename__ = 'task_counters'
+
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), primary_key=True
+    )
+    status: Mapped[TaskStates] = mapped_column(primary_key=True)
+    label_id: Mapped[int] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(nullable=False)
+
+
+# FTS5 index over tasks.title and tasks.description, created and kept in
+# sync by the triggers of migration c2a8e4f71d03. Declared as a lightweight
+# table so it stays out of Base.metadata.
+tasks_fts = table(
+    'tasks_fts',
+    column('rowid', Integer),
+    column('tasks_fts'),
+    column('rank', Float),
+)
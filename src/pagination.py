@@ -0,0 +1,127 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Any
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, asc, desc, literal, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+# SQLite binds integers as signed 64-bit, anything wider overflows.
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+
+@dataclass
+class PageParams:
+    page_size: Annotated[int, Query(gt=0)] = 10
+    page: Annotated[int, Query(ge=0)] = 0
+    cursor: Annotated[str | None, Query()] = None
+
+
+def encode_cursor(order_by: str, value: Any, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    payload = json.dumps([order_by, value, row_id], separators=(',', ':'))
+
+    return urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def is_int64(value: Any) -> bool:
+    # bool is an int subclass, but never a valid key.
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and INT64_MIN <= value <= INT64_MAX
+    )
+
+
+def decode_cursor(
+    cursor: str, order_by: str, column: ColumnElement
+) -> tuple[Any, int]:
+    invalid_cursor_exception = HTTPException(
+        detail='Invalid cursor', status_code=status.HTTP_400_BAD_REQUEST
+    )
+
+    try:
+        cursor_order_by, value, row_id = json.loads(
+            urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        )
+
+        if cursor_order_by != order_by or not is_int64(row_id):
+            raise invalid_cursor_exception
+
+        python_type = column.type.python_type
+
+        if python_type is datetime:
+            value = datetime.fromisoformat(value)
+
+        elif python_type is int:
+            if not is_int64(value):
+                raise invalid_cursor_exception
+
+        else:
+            value = python_type(value)
+
+    except (binascii.Error, OverflowError, TypeError, ValueError):
+        raise invalid_cursor_exception
+
+    return value, row_id
+
+
+def keyset_paginate(
+    statement: Select,
+    column: ColumnElement,
+    tiebreaker: ColumnElement,
+    order_by: str,
+    pagination: PageParams,
+) -> Select:
+    """Order by ``(column, tiebreaker)`` and seek past the cursor.
+
+    One extra row is fetched so the caller can tell whether a next page
+    exists without a separate count query.
+    """
+    sort = order_by.rsplit('-', 1)[1]
+
+    if sort == 'asc':
+        statement = statement.order_by(asc(column), asc(tiebreaker))
+
+    else:
+        statement = statement.order_by(desc(column), desc(tiebreaker))
+
+    if pagination.cursor:
+        value, row_id = decode_cursor(pagination.cursor, order_by, column)
+        key = tuple_(column, tiebreaker)
+        bound = tuple_(
+            literal(value, column.type), literal(row_id, tiebreaker.type)
+        )
+
+        if sort == 'asc':
+            statement = statement.where(key > bound)
+
+        else:
+            statement = statement.where(key < bound)
+
+    else:
+        statement = statement.offset(pagination.page)
+
+    return statement.limit(pagination.page_size + 1)
+
+
+def next_cursor(
+    rows: Sequence, order_by: str, pagination: PageParams
+) -> tuple[Sequence, str | None]:
+    """Split rows into a page and its cursor.
+
+    Rows start with either an instance or its id and end with the sort value.
+    """
+    if len(rows) > pagination.page_size:
+        rows = rows[: pagination.page_size]
+        head, value = rows[-1][0], rows[-1][-1]
+
+        return rows, encode_cursor(order_by, value, getattr(head, 'id', head))
+
+    return rows, None
@@ -0,0 +1,127 @@
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from threading import Lock
+
+from fastapi import HTTPException, status
+
+from src.settings import get_settings
+
+
+class TokenBucketLimiter:
+    """Thread-safe token buckets, one per key, kept in a bounded LRU.
+
+    Each bucket is a ``(tokens, updated_at)`` pair. A bucket that refilled
+    up to ``burst`` is the same as a missing one, so buckets idle for the
+    ``burst / per_second`` it takes any of them to refill are dropped, and
+    the least recently used ones are dropped past ``maxsize``.
+    """
+
+    def __init__(self, burst: int, per_second: float, maxsize: int):
+        self.burst = burst
+        self.per_second = per_second
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+
+    def _evict_idle(self, now: float) -> None:
+        # Buckets are ordered by last use and every one is full again within
+        # burst / per_second of it, so the first one used more recently than
+        # that ends the scan. Full buckets behind it just wait their turn.
+        refill_seconds = self.burst / self.per_second
+
+        while self._buckets:
+            _, updated_at = next(iter(self._buckets.values()))
+
+            if now - updated_at < refill_seconds:
+                break
+
+            self._buckets.popitem(last=False)
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for ``key``.
+
+        Returns 0 when admitted, or the seconds until a token is available.
+        """
+        if self.burst <= 0 or self.maxsize <= 0:
+            return 0.0
+
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle(now)
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(
+                self.burst, tokens + (now - updated_at) * self.per_second
+            )
+            wait = 0.0
+
+            if tokens >= 1:
+                tokens -= 1
+
+            else:
+                wait = (1 - tokens) / self.per_second
+
+            self._buckets[key] = (tokens, now)
+
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+    def refund(self, key: Hashable) -> None:
+        """Give back the token taken by an admitted ``acquire`` of ``key``."""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated_at = self._buckets[key]
+                self._buckets[key] = (min(self.burst, tokens + 1), updated_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._buckets)
+
+
+login_address_limiter = TokenBucketLimiter(
+    burst=get_settings().LOGIN_ADDRESS_BURST,
+    per_second=get_settings().LOGIN_ADDRESS_PER_SECOND,
+    maxsize=get_settings().LOGIN_BUCKETS_MAX_SIZE,
+)
+login_username_limiter = TokenBucketLimiter(
+    burst=get_settings().LOGIN_USERNAME_BURST,
+    per_second=get_settings().LOGIN_USERNAME_PER_SECOND,
+    maxsize=get_settings().LOGIN_BUCKETS_MAX_SIZE,
+)
+
+
+def admit_login(username: str, address: str | None) -> None:
+    """Reject a login attempt with a 429 once either bucket is empty.
+
+    Runs before the user lookup, so a burst of attempts never reaches the
+    Argon2 verify. Clients without an address, e.g. behind a Unix socket,
+    only have a username bucket rather than all sharing one address bucket.
+    """
+    buckets = [(login_username_limiter, username)]
+
+    if address is not None:
+        buckets.insert(0, (login_address_limiter, address))
+
+    for limiter, key in buckets:
+        if wait := limiter.acquire(key):
+            raise HTTPException(
+                detail='Too many login attempts, try again later',
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(math.ceil(wait))},
+            )
+
+
+def login_succeeded(username: str) -> None:
+    # Only failed attempts count against a username, so its owner logging in
+    # never spends what a guesser would lock them out with.
+    login_username_limiter.refund(username)
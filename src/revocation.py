@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.bloom import BloomFilter
+from src.dependencies import session_scope
+from src.models import RevokedTokenModel, current_datetime
+from src.settings import get_settings
+
+LOAD_PARTITION_SIZE = 10_000
+
+# Every jti in revoked_tokens is in the filter, so a miss needs no query.
+revoked_tokens = BloomFilter(
+    size_bytes=get_settings().REVOCATION_FILTER_SIZE_BYTES,
+    error_rate=get_settings().REVOCATION_FILTER_ERROR_RATE,
+)
+
+
+async def is_revoked(session: AsyncSession, jti: str) -> bool:
+    if jti not in revoked_tokens:
+        return False
+
+    return await session.get(RevokedTokenModel, jti) is not None
+
+
+async def revoke(session: AsyncSession, jti: str, expire: float) -> bool:
+    """Record ``jti`` as used.
+
+    Returns False when it already was, which also catches tokens revoked
+    by another process since this one built its filter.
+    """
+    try:
+        session.add(
+            RevokedTokenModel(
+                jti=jti,
+                expires_at=datetime.fromtimestamp(
+                    expire, timezone(timedelta(hours=-3))
+                ),
+            )
+        )
+        await session.commit()
+
+    except IntegrityError:
+        await session.rollback()
+        return False
+
+    except Exception as error:  # pragma: no cover
+        await session.rollback()
+        raise error
+
+    revoked_tokens.add(jti)
+
+    return True
+
+
+async def load_revoked_tokens() -> int:
+    """Drop expired revocations and rebuild the filter from the rest."""
+    revoked_tokens.clear()
+
+    async with session_scope() as session:
+        try:
+            await session.execute(
+                delete(RevokedTokenModel).where(
+                    RevokedTokenModel.expires_at < current_datetime()
+                )
+            )
+            await session.commit()
+
+        except Exception as error:
+            await session.rollback()
+            raise error
+
+        result = await session.stream(select(RevokedTokenModel.jti))
+
+        try:
+            async for rows in result.partitions(LOAD_PARTITION_SIZE):
+                revoked_tokens.update(jti for (jti,) in rows)
+
+        finally:
+            await result.close()
+
+    return revoked_tokens.count
@@ -1,14 +1,22 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Form, HTTPException, status
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.dependencies import get_current_user, get_session
+from src.dependencies import (
+    get_current_user,
+    get_session,
+    oauth2_scheme,
+    pin_to_primary,
+    verify_token,
+)
 from src.models import UserModel
+from src.ratelimit import admit_login, login_succeeded
+from src.revocation import is_revoked, revoke
 from src.schemas import TokenSchema
-from src.security import create_token, verify_password
+from src.security import create_token, verify_password_pooled
 
 router = APIRouter(prefix='/auth', tags=['Auth'])
 
@@ -19,19 +27,33 @@ router = APIRouter(prefix='/auth', tags=['Auth'])
     response_class=JSONResponse,
     response_model=TokenSchema,
 )
-def login(
+async def login(
     username: Annotated[str, Form()],
     password: Annotated[str, Form()],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
 ):
-    user = session.scalar(
+    admit_login(username, request.client and request.client.host)
+
+    user = await session.scalar(
         select(UserModel).where(UserModel.username == username)
     )
 
     if user:
-        if verify_password(password, user.password_hash):
+        if await verify_password_pooled(password, user.password_hash):
+            login_succeeded(username)
+            # The new token's first reads may reach a replica that has not
+            # caught up with the user yet.
+            pin_to_primary(user.username)
             access_token = create_token('access_token', {'sub': user.username})
-            return {'access_token': access_token}
+            refresh_token = create_token(
+                'refresh_token', {'sub': user.username}
+            )
+
+            return {
+                'access_token': access_token,
+                'refresh_token': refresh_token,
+            }
 
     raise HTTPException(
         detail='Incorrect username or password',
@@ -45,11 +67,29 @@ def login(
     response_class=JSONResponse,
     response_model=TokenSchema,
 )
-def refresh_token(
+async def refresh_token(
     current_user: Annotated[
         UserModel, Depends(get_current_user('refresh_token'))
     ],
+    token: Annotated[str, Depends(oauth2_scheme)],
+    session: Annotated[AsyncSession, Depends(get_session)],
 ):
+    # Each refresh token is exchanged once: its jti is revoked in the same
+    # request, and a second use gets a 401.
+    _, expire, jti = verify_token(token, 'refresh_token')
+
+    if (
+        not jti
+        or await is_revoked(session, jti)
+        or not await revoke(session, jti, expire)
+    ):
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            'Invalid or expired token',
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+
+    pin_to_primary(current_user.username)
     access_token = create_token('access_token', {'sub': current_user.username})
     refresh_token = create_token(
         'refresh_token', {'sub': current_user.username}
@@ -11,11 +11,15 @@ from fastapi import (
     status,
 )
 from fastapi.responses import JSONResponse
-from sqlalchemy import asc, desc, select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from src.dependencies import get_current_user, get_session
+from src.etag import ConditionalRequest
+from src.filters import LabelListParams
 from src.models import LabelModel, UserModel
+from src.pagination import keyset_paginate, next_cursor
 from src.schemas import (
     InfoSuccessSchema,
     LabelCreateSchema,
@@ -23,6 +27,14 @@ from src.schemas import (
     LabelsPublicSchema,
     LabelUpdateSchema,
 )
+from src.serializers import (
+    LABEL_COLUMNS,
+    LABEL_FIELD_COLUMNS,
+    labels_page_response,
+    sparse_columns,
+    sparse_page_response,
+)
+from src.settings import get_settings
 
 router = APIRouter(prefix='/label', tags=['Label'])
 
@@ -33,11 +45,11 @@ router = APIRouter(prefix='/label', tags=['Label'])
     response_class=JSONResponse,
     response_model=LabelPublicSchema,
 )
-def create_label(
+async def create_label(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     label_input: Annotated[LabelCreateSchema, Body()],
 ):
     current_datetime = datetime.now(timezone(timedelta(hours=-3)))
@@ -52,11 +64,11 @@ def create_label(
 
     try:
         session.add(label)
-        session.commit()
-        session.refresh(label)
+        await session.commit()
+        await session.refresh(label)
 
     except Exception as error:  # pragma: no cover
-        session.rollback()
+        await session.rollback()
         raise error
 
     return label
@@ -68,45 +80,103 @@ def create_label(
     response_class=JSONResponse,
     response_model=LabelsPublicSchema,
 )
-def show_all_labels(
+async def show_all_labels(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
-    page_size: Annotated[int, Query(gt=0)] = 10,
-    page: Annotated[int, Query(ge=0)] = 0,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    pagination: Annotated[LabelListParams, Depends()],
+    conditional: Annotated[ConditionalRequest, Depends()],
     order_by: Annotated[
         str,
         Query(
             pattern=r'^(?:(?:id|title|color|priority|created_at)-'
             r'(?:asc|desc)){1}$'
         ),
-    ] = 'priority-desc,',
+    ] = 'priority-desc',
 ):
-    column, sort = order_by.split('-')
+    column = order_by.split('-')[0]
 
     orders = {
         'id': LabelModel.id,
         'title': LabelModel.title,
         'color': LabelModel.color,
         'priority': LabelModel.priority,
+        'created_at': LabelModel.created_at,
     }
 
-    if sort == 'asc':
-        order = asc(orders[column])
+    # Validated over the page window only, like /task/all: the id sum moves
+    # when labels enter or leave it and the max updated_at on any edit.
+    window = keyset_paginate(
+        select(LabelModel.id, LabelModel.updated_at).where(
+            LabelModel.user_id == current_user.id
+        ),
+        orders[column],
+        LabelModel.id,
+        order_by,
+        pagination,
+    ).subquery()
+
+    if response := conditional.not_modified(
+        current_user.id,
+        *(
+            await session.execute(
+                select(
+                    func.count(),
+                    func.sum(window.c.id),
+                    func.max(window.c.updated_at),
+                )
+            )
+        ).one(),
+    ):
+        return response
+
+    fields = pagination.field_set()
+    fast_path = get_settings().LIST_SERIALIZATION == 'rows'
+
+    if fast_path and fields:
+        statement = select(
+            LabelModel.id,
+            *sparse_columns(fields, LABEL_FIELD_COLUMNS),
+            orders[column],
+        )
+
+    elif fast_path:
+        statement = select(*LABEL_COLUMNS, orders[column])
 
     else:
-        order = desc(orders[column])
+        statement = select(LabelModel, orders[column])
+
+        if fields:
+            statement = statement.options(
+                load_only(
+                    LabelModel.id,
+                    *(LABEL_FIELD_COLUMNS[name][0] for name in fields),
+                )
+            )
+
+    statement = keyset_paginate(
+        statement.where(LabelModel.user_id == current_user.id),
+        orders[column],
+        LabelModel.id,
+        order_by,
+        pagination,
+    )
+
+    rows = (await session.execute(statement)).all()
+    rows, cursor = next_cursor(rows, order_by, pagination)
+
+    if fast_path:
+        return labels_page_response(rows, cursor, conditional.headers, fields)
 
-    labels = session.scalars(
-        select(LabelModel)
-        .where(LabelModel.user_id == current_user.id)
-        .limit(page_size)
-        .offset(page)
-        .order_by(order)
-    ).all()
+    page = {'labels': [label for label, _ in rows], 'next_cursor': cursor}
 
-    return {'labels': labels}
+    if fields:
+        return sparse_page_response(
+            LabelsPublicSchema, 'labels', fields, page, conditional.headers
+        )
+
+    return page
 
 
 @router.get(
@@ -115,14 +185,26 @@ def show_all_labels(
     response_class=JSONResponse,
     response_model=LabelPublicSchema,
 )
-def show_label(
+async def show_label(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     label_id: Annotated[int, Path()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    label = session.scalar(
+    updated_at = await session.scalar(
+        select(LabelModel.updated_at).where(
+            LabelModel.user_id == current_user.id, LabelModel.id == label_id
+        )
+    )
+
+    if updated_at and (
+        response := conditional.not_modified(current_user.id, updated_at)
+    ):
+        return response
+
+    label = await session.scalar(
         select(LabelModel).where(
             LabelModel.user_id == current_user.id, LabelModel.id == label_id
         )
@@ -143,15 +225,15 @@ def show_label(
     response_class=JSONResponse,
     response_model=LabelPublicSchema,
 )
-def update_label(
+async def update_label(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     label_id: Annotated[int, Path()],
     label_input: Annotated[LabelUpdateSchema, Body()],
 ):
-    label = session.scalar(
+    label = await session.scalar(
         select(LabelModel).where(
             LabelModel.user_id == current_user.id, LabelModel.id == label_id
         )
@@ -165,11 +247,11 @@ def update_label(
 
         try:
             session.add(label)
-            session.commit()
-            session.refresh(label)
+            await session.commit()
+            await session.refresh(label)
 
         except Exception as error:  # pragma: no cover
-            session.rollback()
+            await session.rollback()
             raise error
 
         return label
@@ -185,14 +267,14 @@ def update_label(
     response_class=JSONResponse,
     response_model=InfoSuccessSchema,
 )
-def delete_label(
+async def delete_label(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     label_id: Annotated[int, Path()],
 ):
-    label = session.scalar(
+    label = await session.scalar(
         select(LabelModel).where(
             LabelModel.user_id == current_user.id, LabelModel.id == label_id
         )
@@ -200,11 +282,11 @@ def delete_label(
 
     if label:
         try:
-            session.delete(label)
-            session.commit()
+            await session.delete(label)
+            await session.commit()
 
         except Exception as error:  # pragma: no cover
-            session.rollback()
+            await session.rollback()
             raise error
 
         return {'success': 'Label deleted successfully'}
@@ -1,5 +1,7 @@
+import unicodedata
+import zlib
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import (
     APIRouter,
@@ -8,24 +10,288 @@ from fastapi import (
     HTTPException,
     Path,
     Query,
+    Request,
     status,
 )
-from fastapi.responses import JSONResponse
-from sqlalchemy import asc, desc, select
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import Field, ValidationError
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    case,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    contains_eager,
+    joinedload,
+    load_only,
+    noload,
+    selectinload,
+)
 
-from src.dependencies import get_current_user, get_session
-from src.models import LabelModel, TaskModel, TaskStates, UserModel
+from src.dependencies import get_current_user, get_session, session_scope
+from src.etag import ConditionalRequest
+from src.filters import TaskListParams
+from src.importers import csv_records, ndjson_records
+from src.models import (
+    LabelModel,
+    TaskCounterModel,
+    TaskModel,
+    TaskStates,
+    UserModel,
+    current_datetime,
+    tasks_fts,
+)
+from src.pagination import PageParams, keyset_paginate, next_cursor
 from src.schemas import (
     InfoSuccessSchema,
+    TaskBulkUpdateSchema,
     TaskCreateSchema,
     TaskPublicSchema,
+    TasksBulkResultSchema,
+    TasksImportResultSchema,
     TasksPublicSchema,
+    TaskStatsSchema,
     TaskUpdateSchema,
 )
+from src.serializers import (
+    TASK_COLUMNS,
+    TASK_FIELD_COLUMNS,
+    sparse_columns,
+    sparse_page_response,
+    task_lines,
+    tasks_page_response,
+)
+from src.settings import get_settings
 
 router = APIRouter(prefix='/task', tags=['Task'])
 
+BULK_MAX_ITEMS = 1000
+EXPORT_YIELD_PER = 500
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_ERRORS = 1000
+SEARCH_MAX_LENGTH = 200
+NOT_NULL_TASK_FIELDS = frozenset(
+    column.key for column in TaskModel.__table__.columns if not column.nullable
+)
+
+
+def task_label_loader():
+    if get_settings().TASK_LABEL_LOADING == 'joined':
+        return joinedload(TaskModel.label)
+
+    return selectinload(TaskModel.label)
+
+
+async def reload_task(session: AsyncSession, task_id: int) -> TaskModel:
+    # Written tasks are returned with their label, loaded like the read
+    # routes load it, so serializing them never lazy loads.
+    return await session.scalar(
+        select(TaskModel)
+        .where(TaskModel.id == task_id)
+        .options(task_label_loader())
+        .execution_options(populate_existing=True)
+    )
+
+
+def task_list_statement(
+    order: ColumnElement,
+    by_label: bool,
+    fields: tuple[str, ...] | None,
+    fast_path: bool,
+) -> Select:
+    """Select the task columns of a page, joining labels only if needed."""
+    with_label = fields is None or 'label' in fields
+
+    if fast_path:
+        columns = TASK_COLUMNS
+
+        if fields is not None:
+            columns = (
+                TaskModel.id,
+                *sparse_columns(fields, TASK_FIELD_COLUMNS),
+            )
+
+        statement = select(*columns, order)
+
+        if by_label:
+            return statement.join(LabelModel)
+
+        if with_label:
+            return statement.outerjoin(LabelModel)
+
+        return statement
+
+    statement = select(TaskModel, order)
+
+    if fields:
+        statement = statement.options(
+            load_only(
+                TaskModel.id,
+                *(
+                    TASK_FIELD_COLUMNS[name][0]
+                    for name in fields
+                    if name != 'label'
+                ),
+            )
+        )
+
+    if not with_label:
+        statement = statement.options(noload(TaskModel.label))
+
+        return statement.join(LabelModel) if by_label else statement
+
+    if by_label:
+        return statement.join(LabelModel).options(
+            contains_eager(TaskModel.label)
+        )
+
+    return statement.options(task_label_loader())
+
+
+def match_query(search: str) -> str:
+    # Every word becomes an FTS5 string, so the input is never parsed as
+    # query syntax (column filters, NEAR, AND/OR/NOT, prefixes). Blank input
+    # and control characters would still be FTS5 syntax errors.
+    if not search.split() or any(
+        unicodedata.category(char) == 'Cc' for char in search
+    ):
+        raise HTTPException(
+            detail='Invalid search query',
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    return ' '.join(
+        '"' + term.replace('"', '""') + '"' for term in search.split()
+    )
+
+
+async def export_task_lines(user_id: str, compress: bool):
+    # The request's session is closed before a streaming body is sent, so
+    # the export holds its own for as long as the client keeps reading.
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    async with session_scope() as session:
+        result = await session.stream(
+            select(*TASK_COLUMNS)
+            .outerjoin(LabelModel)
+            .where(TaskModel.user_id == user_id)
+            .order_by(TaskModel.id)
+            .execution_options(yield_per=EXPORT_YIELD_PER)
+        )
+
+        try:
+            async for rows in result.partitions(EXPORT_YIELD_PER):
+                chunk = task_lines(rows)
+
+                if compressor:
+                    chunk = compressor.compress(chunk)
+
+                if chunk:
+                    yield chunk
+
+        finally:
+            await result.close()
+
+    if compressor:
+        yield compressor.flush()
+
+
+def import_task_row(
+    record: dict,
+    label_titles: dict[str, int],
+    label_ids: set[int],
+    user_id: str,
+    current_datetime: datetime,
+) -> dict:
+    label = record.pop('label', None)
+
+    if isinstance(label, dict):
+        label = label.get('title')
+
+    record['label_id'] = record.get('label_id') or None
+
+    task_input = TaskCreateSchema.model_validate(record)
+
+    if task_input.expires_at.timestamp() < current_datetime.timestamp():
+        raise ValueError('Expires_at is in the past')
+
+    label_id = task_input.label_id
+
+    if label:
+        if not isinstance(label, str) or label not in label_titles:
+            raise ValueError('Label not found')
+
+        label_id = label_titles[label]
+
+    elif label_id and label_id not in label_ids:
+        raise ValueError('Label not found')
+
+    return {
+        'title': task_input.title,
+        'description': task_input.description,
+        'status': TaskStates.PENDING,
+        'expires_at': task_input.expires_at,
+        'label_id': label_id,
+        'user_id': user_id,
+        'updated_at': current_datetime,
+        'created_at': current_datetime,
+    }
+
+
+async def insert_task_rows(session: AsyncSession, rows: list[dict]) -> None:
+    try:
+        await session.execute(insert(TaskModel.__table__), rows)
+        await session.commit()
+
+    except Exception as error:  # pragma: no cover
+        await session.rollback()
+        raise error
+
+
+def tasks_window_validator(window: Select) -> Select:
+    """Summarize the rows of a page window into its validator.
+
+    The id sum moves when rows enter or leave the window, the max
+    updated_at when one of them is edited, and the overdue count when
+    current_status switches to expired without touching updated_at.
+    """
+    window = window.subquery()
+
+    return select(
+        func.count(),
+        func.sum(window.c.id),
+        func.max(window.c.updated_at),
+        func.count(case((window.c.expires_at < current_datetime(), 1))),
+        func.count(window.c.label_updated_at),
+        func.max(window.c.label_updated_at),
+    )
+
+
+async def owned_label_ids(
+    session: AsyncSession, current_user: UserModel, label_ids: set[int | None]
+) -> set[int]:
+    label_ids.discard(None)
+
+    if not label_ids:
+        return set()
+
+    return set(
+        (
+            await session.scalars(
+                select(LabelModel.id).where(
+                    LabelModel.user_id == current_user.id,
+                    LabelModel.id.in_(label_ids),
+                )
+            )
+        ).all()
+    )
+
 
 @router.post(
     '/',
@@ -33,11 +299,11 @@ router = APIRouter(prefix='/task', tags=['Task'])
     response_class=JSONResponse,
     response_model=TaskPublicSchema,
 )
-def create_task(
+async def create_task(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     task_input: Annotated[TaskCreateSchema, Body()],
 ):
     current_datetime = datetime.now(timezone.utc) - timedelta(hours=3)
@@ -57,7 +323,7 @@ def create_task(
     )
 
     if task_input.label_id:
-        label = session.scalar(
+        label = await session.scalar(
             select(LabelModel).where(
                 LabelModel.user_id == current_user.id,
                 LabelModel.id == task_input.label_id,
@@ -78,14 +344,321 @@ def create_task(
 
     try:
         session.add(task)
-        session.commit()
-        session.refresh(task)
+        await session.commit()
 
     except Exception as error:  # pragma: no cover
-        session.rollback()
+        await session.rollback()
         raise error
 
-    return task
+    return await reload_task(session, task.id)
+
+
+@router.post(
+    '/bulk',
+    status_code=status.HTTP_200_OK,
+    response_class=JSONResponse,
+    response_model=TasksBulkResultSchema,
+)
+async def create_tasks(
+    current_user: Annotated[
+        UserModel, Depends(get_current_user('access_token'))
+    ],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    tasks_input: Annotated[
+        list[TaskCreateSchema], Body(min_length=1, max_length=BULK_MAX_ITEMS)
+    ],
+):
+    current_datetime = datetime.now(timezone(timedelta(hours=-3)))
+    labels_in_db = await owned_label_ids(
+        session, current_user, {task.label_id for task in tasks_input}
+    )
+    results, rows = [], []
+
+    for index, task_input in enumerate(tasks_input):
+        if task_input.expires_at.timestamp() < current_datetime.timestamp():
+            results.append({
+                'index': index,
+                'status_code': status.HTTP_400_BAD_REQUEST,
+                'detail': 'Expires_at is in the past',
+            })
+
+        elif task_input.label_id and task_input.label_id not in labels_in_db:
+            results.append({
+                'index': index,
+                'status_code': status.HTTP_404_NOT_FOUND,
+                'detail': 'Label not found',
+            })
+
+        else:
+            results.append({
+                'index': index,
+                'status_code': status.HTTP_201_CREATED,
+            })
+            rows.append({
+                'title': task_input.title,
+                'description': task_input.description,
+                'status': TaskStates.PENDING,
+                'expires_at': task_input.expires_at,
+                'label_id': task_input.label_id,
+                'user_id': current_user.id,
+                'updated_at': current_datetime,
+                'created_at': current_datetime,
+            })
+
+    if rows:
+        try:
+            # A Core insert keeps NULL label_ids in the batch, where the ORM
+            # would split it at every change of key set. Ids are assigned in
+            # parameter order within the multi-row INSERT, so sorting them
+            # avoids the row-per-statement fallback of sort_by_parameter_order.
+            task_ids = sorted(
+                (
+                    await session.scalars(
+                        insert(TaskModel.__table__).returning(
+                            TaskModel.__table__.c.id
+                        ),
+                        rows,
+                    )
+                ).all()
+            )
+            await session.commit()
+
+        except Exception as error:  # pragma: no cover
+            await session.rollback()
+            raise error
+
+        created_ids = iter(task_ids)
+
+        for result in results:
+            if result['status_code'] == status.HTTP_201_CREATED:
+                result['id'] = next(created_ids)
+
+    return {'results': results}
+
+
+@router.patch(
+    '/bulk',
+    status_code=status.HTTP_200_OK,
+    response_class=JSONResponse,
+    response_model=TasksBulkResultSchema,
+)
+async def update_tasks(
+    current_user: Annotated[
+        UserModel, Depends(get_current_user('access_token'))
+    ],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    tasks_input: Annotated[
+        list[TaskBulkUpdateSchema],
+        Body(min_length=1, max_length=BULK_MAX_ITEMS),
+    ],
+):
+    current_datetime = datetime.now(timezone(timedelta(hours=-3)))
+    tasks_in_db = set(
+        (
+            await session.scalars(
+                select(TaskModel.id).where(
+                    TaskModel.user_id == current_user.id,
+                    TaskModel.id.in_({task.id for task in tasks_input}),
+                )
+            )
+        ).all()
+    )
+    labels_in_db = await owned_label_ids(
+        session, current_user, {task.label_id for task in tasks_input}
+    )
+    results, rows = [], []
+
+    for index, task_input in enumerate(tasks_input):
+        result = {'index': index, 'id': task_input.id}
+        results.append(result)
+        values = task_input.model_dump(exclude_unset=True)
+        null_fields = [
+            key
+            for key, value in values.items()
+            if value is None and key in NOT_NULL_TASK_FIELDS
+        ]
+
+        if task_input.id not in tasks_in_db:
+            result['status_code'] = status.HTTP_404_NOT_FOUND
+            result['detail'] = 'Task not found'
+
+        elif null_fields:
+            # Caught per item, or the executemany fails the whole batch.
+            result['status_code'] = status.HTTP_400_BAD_REQUEST
+            result['detail'] = (
+                f'{", ".join(null_fields).capitalize()} cannot be null'
+            )
+
+        elif (
+            task_input.expires_at
+            and task_input.expires_at.timestamp()
+            < current_datetime.timestamp()
+        ):
+            result['status_code'] = status.HTTP_400_BAD_REQUEST
+            result['detail'] = 'The datetime entered is in the past'
+
+        elif task_input.label_id and task_input.label_id not in labels_in_db:
+            result['status_code'] = status.HTTP_404_NOT_FOUND
+            result['detail'] = 'Label not found'
+
+        else:
+            result['status_code'] = status.HTTP_200_OK
+            rows.append({
+                **values,
+                'id': task_input.id,
+                'updated_at': current_datetime,
+            })
+
+    if rows:
+        try:
+            await session.execute(update(TaskModel), rows)
+            await session.commit()
+
+        except Exception as error:  # pragma: no cover
+            await session.rollback()
+            raise error
+
+    return {'results': results}
+
+
+@router.delete(
+    '/bulk',
+    status_code=status.HTTP_200_OK,
+    response_class=JSONResponse,
+    response_model=TasksBulkResultSchema,
+)
+async def delete_tasks(
+    current_user: Annotated[
+        UserModel, Depends(get_current_user('access_token'))
+    ],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    task_ids: Annotated[
+        list[Annotated[int, Field(gt=0)]],
+        Body(min_length=1, max_length=BULK_MAX_ITEMS),
+    ],
+):
+    try:
+        deleted = set(
+            (
+                await session.scalars(
+                    delete(TaskModel)
+                    .where(
+                        TaskModel.user_id == current_user.id,
+                        TaskModel.id.in_(set(task_ids)),
+                    )
+                    .returning(TaskModel.id)
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+        )
+        await session.commit()
+
+    except Exception as error:  # pragma: no cover
+        await session.rollback()
+        raise error
+
+    results = []
+
+    for index, task_id in enumerate(task_ids):
+        # Only the first occurrence of an id deleted it; repeats find
+        # nothing left to delete.
+        if task_id in deleted:
+            deleted.remove(task_id)
+            results.append({
+                'index': index,
+                'id': task_id,
+                'status_code': status.HTTP_200_OK,
+            })
+
+        else:
+            results.append({
+                'index': index,
+                'id': task_id,
+                'status_code': status.HTTP_404_NOT_FOUND,
+                'detail': 'Task not found',
+            })
+
+    return {'results': results}
+
+
+@router.post(
+    '/import',
+    status_code=status.HTTP_200_OK,
+    response_class=JSONResponse,
+    response_model=TasksImportResultSchema,
+    openapi_extra={
+        'requestBody': {
+            'content': {'application/x-ndjson': {}, 'text/csv': {}},
+            'required': True,
+        }
+    },
+)
+async def import_tasks(
+    current_user: Annotated[
+        UserModel, Depends(get_current_user('access_token'))
+    ],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
+    file_format: Annotated[
+        Literal['ndjson', 'csv'], Query(alias='format')
+    ] = 'ndjson',
+):
+    current_datetime = datetime.now(timezone(timedelta(hours=-3)))
+    label_titles, label_ids = {}, set()
+
+    for label_id, title in (
+        await session.execute(
+            select(LabelModel.id, LabelModel.title)
+            .where(LabelModel.user_id == current_user.id)
+            .order_by(LabelModel.id)
+        )
+    ).all():
+        label_titles.setdefault(title, label_id)
+        label_ids.add(label_id)
+
+    records = csv_records if file_format == 'csv' else ndjson_records
+    accepted, rejected, errors, rows = 0, 0, [], []
+
+    async for line, record, parse_error in records(request.stream()):
+        detail = parse_error
+
+        if record is not None:
+            try:
+                rows.append(
+                    import_task_row(
+                        record,
+                        label_titles,
+                        label_ids,
+                        current_user.id,
+                        current_datetime,
+                    )
+                )
+
+            except ValidationError as error:
+                detail = '; '.join(
+                    f'{".".join(map(str, item["loc"]))}: {item["msg"]}'
+                    for item in error.errors()
+                )
+
+            except ValueError as error:
+                detail = str(error)
+
+        if detail is not None:
+            rejected += 1
+
+            if len(errors) < IMPORT_MAX_ERRORS:
+                errors.append({'line': line, 'detail': detail})
+
+        if len(rows) >= IMPORT_CHUNK_SIZE:
+            await insert_task_rows(session, rows)
+            accepted += len(rows)
+            rows = []
+
+    if rows:
+        await insert_task_rows(session, rows)
+        accepted += len(rows)
+
+    return {'accepted': accepted, 'rejected': rejected, 'errors': errors}
 
 
 @router.get(
@@ -94,13 +667,13 @@ def create_task(
     response_class=JSONResponse,
     response_model=TasksPublicSchema,
 )
-def show_all_tasks(
+async def show_all_tasks(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
-    page_size: Annotated[int, Query(gt=0)] = 10,
-    page: Annotated[int, Query(ge=0)] = 0,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    pagination: Annotated[TaskListParams, Depends()],
+    conditional: Annotated[ConditionalRequest, Depends()],
     order_by: Annotated[
         str,
         Query(
@@ -113,7 +686,7 @@ def show_all_tasks(
     orders = {
         'task_id': TaskModel.id,
         'task_title': TaskModel.title,
-        'task_description': TaskModel.description,
+        'task_description': func.coalesce(TaskModel.description, ''),
         'task_status': TaskModel.status,
         'task_expires_at': TaskModel.expires_at,
         'label_id': LabelModel.id,
@@ -122,48 +695,180 @@ def show_all_tasks(
         'label_priority': LabelModel.priority,
     }
 
-    column, sort = order_by.split('-')
+    column = order_by.split('-')[0]
+    by_label = column[:4] != 'task'
+    where = (TaskModel.user_id == current_user.id, *pagination.clauses())
+    total = None
 
-    if sort == 'asc':
-        order = asc(orders[column])
+    if pagination.include_total:
+        total = await session.scalar(
+            select(func.count()).select_from(TaskModel).where(*where)
+        )
 
-    elif sort == 'desc':
-        order = desc(orders[column])
+    # The validator covers the same window as the page, so it costs one
+    # page however many tasks the user has.
+    window = keyset_paginate(
+        select(
+            TaskModel.id,
+            TaskModel.updated_at,
+            TaskModel.expires_at,
+            LabelModel.updated_at.label('label_updated_at'),
+        )
+        .join_from(TaskModel, LabelModel, isouter=not by_label)
+        .where(*where),
+        orders[column],
+        TaskModel.id,
+        order_by,
+        pagination,
+    )
 
-    if column[:4] == 'task':
-        tasks = session.scalars(
-            select(TaskModel)
-            .where(TaskModel.user_id == current_user.id)
-            .limit(page_size)
-            .offset(page)
-            .order_by(order)
-        ).all()
+    if response := conditional.not_modified(
+        current_user.id,
+        total,
+        *(await session.execute(tasks_window_validator(window))).one(),
+    ):
+        return response
+
+    fields = pagination.field_set()
+    fast_path = get_settings().LIST_SERIALIZATION == 'rows'
+    statement = task_list_statement(
+        orders[column], by_label, fields, fast_path
+    )
+    statement = keyset_paginate(
+        statement.where(*where),
+        orders[column],
+        TaskModel.id,
+        order_by,
+        pagination,
+    )
+
+    rows = (await session.execute(statement)).all()
+    rows, cursor = next_cursor(rows, order_by, pagination)
+
+    if fast_path:
+        return tasks_page_response(
+            rows, cursor, conditional.headers, total, fields
+        )
+
+    page = {
+        'tasks': [task for task, _ in rows],
+        'next_cursor': cursor,
+        'total': total,
+    }
+
+    if fields:
+        return sparse_page_response(
+            TasksPublicSchema, 'tasks', fields, page, conditional.headers
+        )
+
+    return page
+
+
+@router.get(
+    '/export',
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def export_tasks(
+    current_user: Annotated[
+        UserModel, Depends(get_current_user('access_token'))
+    ],
+    gzip: Annotated[bool, Query()] = False,
+):
+    filename = 'tasks.ndjson.gz' if gzip else 'tasks.ndjson'
+
+    return StreamingResponse(
+        export_task_lines(current_user.id, gzip),
+        media_type='application/gzip' if gzip else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    '/stats',
+    status_code=status.HTTP_200_OK,
+    response_class=JSONResponse,
+    response_model=TaskStatsSchema,
+)
+async def show_task_stats(
+    current_user: Annotated[
+        UserModel, Depends(get_current_user('access_token'))
+    ],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    # One row per (status, label) pair, whatever the number of tasks. The
+    # status is the stored one, which the expiry job moves to expired.
+    counters = await session.execute(
+        select(
+            TaskCounterModel.status,
+            TaskCounterModel.label_id,
+            TaskCounterModel.count,
+        ).where(
+            TaskCounterModel.user_id == current_user.id,
+            TaskCounterModel.count > 0,
+        )
+    )
+    by_status = dict.fromkeys(TaskStates, 0)
+    by_label = {}
+
+    for task_status, label_id, count in counters:
+        by_status[task_status] += count
+        by_label[label_id or None] = by_label.get(label_id or None, 0) + count
+
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'by_label': [
+            {'label_id': label_id, 'count': count}
+            for label_id, count in by_label.items()
+        ],
+    }
+
+
+@router.get(
+    '/search',
+    status_code=status.HTTP_200_OK,
+    response_class=JSONResponse,
+    response_model=TasksPublicSchema,
+)
+async def search_tasks(
+    current_user: Annotated[
+        UserModel, Depends(get_current_user('access_token'))
+    ],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    pagination: Annotated[PageParams, Depends()],
+    q: Annotated[str, Query(min_length=1, max_length=SEARCH_MAX_LENGTH)],
+):
+    # bm25 scores are negative and lower is better, so the best matches
+    # come first in ascending order. They depend on the whole index, so a
+    # page can shift slightly when tasks are written between requests.
+    rank = tasks_fts.c.rank
+    fast_path = get_settings().LIST_SERIALIZATION == 'rows'
+
+    if fast_path:
+        statement = select(*TASK_COLUMNS, rank).outerjoin(LabelModel)
 
     else:
-        tasks = session.scalars(
-            select(TaskModel)
-            .join(LabelModel)
-            .where(TaskModel.user_id == current_user.id)
-            .limit(page_size)
-            .offset(page)
-            .order_by(order)
-        ).all()
+        statement = select(TaskModel, rank).options(task_label_loader())
 
-    for task in tasks:
-        if (
-            task.expires_at.timestamp()
-            < datetime.now(timezone(timedelta(hours=-3))).timestamp()
-        ):
-            task.status = TaskStates.EXPIRED
+    statement = keyset_paginate(
+        statement.join(tasks_fts, tasks_fts.c.rowid == TaskModel.id).where(
+            tasks_fts.c.tasks_fts.match(match_query(q)),
+            TaskModel.user_id == current_user.id,
+        ),
+        rank,
+        TaskModel.id,
+        'rank-asc',
+        pagination,
+    )
 
-    try:
-        session.add(tasks)
-        session.commit()
-    except Exception as error:
-        session.rollback()
-        raise error
+    rows = (await session.execute(statement)).all()
+    rows, cursor = next_cursor(rows, 'rank-asc', pagination)
+
+    if fast_path:
+        return tasks_page_response(rows, cursor)
 
-    return {'tasks': tasks}
+    return {'tasks': [task for task, _ in rows], 'next_cursor': cursor}
 
 
 @router.get(
@@ -172,32 +877,39 @@ def show_all_tasks(
     response_class=JSONResponse,
     response_model=TaskPublicSchema,
 )
-def show_task(
+async def show_task(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     task_id: Annotated[int, Path(gt=0)],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    task = session.scalar(
-        select(TaskModel).where(
-            TaskModel.user_id == current_user.id, TaskModel.id == task_id
+    validator = (
+        await session.execute(
+            select(
+                TaskModel.updated_at,
+                TaskModel.expires_at < current_datetime(),
+                LabelModel.updated_at,
+            )
+            .outerjoin(LabelModel)
+            .where(
+                TaskModel.user_id == current_user.id, TaskModel.id == task_id
+            )
         )
-    )
-    if task:
-        if (
-            task.expires_at.timestamp()
-            < datetime.now(timezone(timedelta(hours=-3))).timestamp()
-        ):
-            task.status = TaskStates.EXPIRED
+    ).first()
 
-            try:
-                session.add(task)
-                session.commit()
-            except Exception as error:
-                session.rollback()
-                raise error
+    if validator and (
+        response := conditional.not_modified(current_user.id, *validator)
+    ):
+        return response
 
+    task = await session.scalar(
+        select(TaskModel)
+        .where(TaskModel.user_id == current_user.id, TaskModel.id == task_id)
+        .options(task_label_loader())
+    )
+    if task:
         return task
 
     raise HTTPException(
@@ -211,15 +923,15 @@ def show_task(
     response_class=JSONResponse,
     response_model=TaskPublicSchema,
 )
-def update_task(
+async def update_task(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     task_id: Annotated[int, Path()],
     task_input: Annotated[TaskUpdateSchema, Body()],
 ):
-    task = session.scalar(
+    task = await session.scalar(
         select(TaskModel).where(
             TaskModel.user_id == current_user.id, TaskModel.id == task_id
         )
@@ -239,7 +951,7 @@ def update_task(
                 task.expires_at = task_input.expires_at
 
         if task_input.label_id:
-            label_in_db = session.scalar(
+            label_in_db = await session.scalar(
                 select(LabelModel).where(
                     LabelModel.user_id == current_user.id,
                     LabelModel.id == task_input.label_id,
@@ -261,14 +973,13 @@ def update_task(
 
         try:
             session.add(task)
-            session.commit()
-            session.refresh(task)
+            await session.commit()
 
         except Exception as error:
-            session.rollback()
+            await session.rollback()
             raise error
 
-        return task
+        return await reload_task(session, task.id)
 
     raise HTTPException(
         detail='Task not found', status_code=status.HTTP_404_NOT_FOUND
@@ -281,14 +992,14 @@ def update_task(
     response_class=JSONResponse,
     response_model=InfoSuccessSchema,
 )
-def delete_task(
+async def delete_task(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     task_id: Annotated[int, Path()],
 ):
-    task = session.scalar(
+    task = await session.scalar(
         select(TaskModel).where(
             TaskModel.user_id == current_user.id, TaskModel.id == task_id
         )
@@ -296,11 +1007,11 @@ def delete_task(
 
     if task:
         try:
-            session.delete(task)
-            session.commit()
+            await session.delete(task)
+            await session.commit()
 
         except Exception as error:
-            session.rollback()
+            await session.rollback()
             raise error
 
         return {'success': 'Task deleted successfully'}
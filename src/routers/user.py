@@ -5,9 +5,14 @@ from typing import Annotated
 from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from sqlalchemy import or_, select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.dependencies import get_current_user, get_session
+from src.dependencies import (
+    get_current_user,
+    get_session,
+    pin_to_primary,
+    user_cache,
+)
 from src.models import UserModel
 from src.schemas import (
     InfoSuccessSchema,
@@ -15,7 +20,7 @@ from src.schemas import (
     UserPublicSchema,
     UserUpdateSchema,
 )
-from src.security import get_password_hash
+from src.security import get_password_hash_pooled
 
 router = APIRouter(prefix='/user', tags=['User'])
 
@@ -26,11 +31,11 @@ router = APIRouter(prefix='/user', tags=['User'])
     response_class=JSONResponse,
     response_model=UserPublicSchema,
 )
-def create_user(
+async def create_user(
     user_input: Annotated[UserCreateSchema, Body()],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
 ):
-    db_user = session.scalar(
+    db_user = await session.scalar(
         select(UserModel).where(
             or_(
                 UserModel.email == user_input.email,
@@ -57,19 +62,21 @@ def create_user(
         id=str(uuid.uuid4()),
         email=user_input.email,
         username=user_input.username,
-        password_hash=get_password_hash(user_input.password),
+        password_hash=await get_password_hash_pooled(user_input.password),
         updated_at=current_datetime,
         created_at=current_datetime,
     )
 
     try:
         session.add(user)
-        session.commit()
+        await session.commit()
 
     except Exception as error:
-        session.rollback()
+        await session.rollback()
         raise error
 
+    pin_to_primary(user.username)
+
     return user
 
 
@@ -79,7 +86,7 @@ def create_user(
     response_class=JSONResponse,
     response_model=UserPublicSchema,
 )
-def show_user(
+async def show_user(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
@@ -93,19 +100,21 @@ def show_user(
     response_class=JSONResponse,
     response_model=UserPublicSchema,
 )
-def update_user(
+async def update_user(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     user_input: Annotated[UserUpdateSchema, Body()],
 ):
     if user_input.username or user_input.email or user_input.password:
+        cached_username = current_user.username
+
         if (
             user_input.username
             and user_input.username != current_user.username
         ):
-            result = session.scalar(
+            result = await session.scalar(
                 select(UserModel).where(
                     UserModel.username == user_input.username
                 )
@@ -120,7 +129,7 @@ def update_user(
             current_user.username = user_input.username
 
         if user_input.email and user_input.email != current_user.email:
-            result = session.scalar(
+            result = await session.scalar(
                 select(UserModel).where(UserModel.email == user_input.email)
             )
 
@@ -133,18 +142,22 @@ def update_user(
             current_user.email = user_input.email
 
         if user_input.password:
-            current_user.password_hash = get_password_hash(user_input.password)
+            current_user.password_hash = await get_password_hash_pooled(
+                user_input.password
+            )
 
         current_user.updated_at = datetime.now(timezone(timedelta(hours=-3)))
 
         try:
             session.add(current_user)
-            session.commit()
+            await session.commit()
 
         except Exception as error:  # pragma: no cover
-            session.rollback()
+            await session.rollback()
             raise error
 
+        user_cache.pop(cached_username)
+
         return current_user
 
     raise HTTPException(
@@ -158,20 +171,22 @@ def update_user(
     response_class=JSONResponse,
     response_model=InfoSuccessSchema,
 )
-def delete_user(
+async def delete_user(
     current_user: Annotated[
         UserModel, Depends(get_current_user('access_token'))
     ],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
 ):
     try:
-        session.delete(current_user)
-        session.commit()
+        await session.delete(current_user)
+        await session.commit()
 
     except Exception as error:  # pragma: no cover
-        session.rollback()
+        await session.rollback()
         raise error
 
+    user_cache.pop(current_user.username)
+
     return JSONResponse(
         content={'success': 'User deleted successfully'},
         status_code=status.HTTP_200_OK,
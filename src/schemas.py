@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Annotated
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, EmailStr, Field
 
 from src.models import TaskStates
 
@@ -51,6 +51,7 @@ class LabelPublicSchema(BaseModel):
 
 class LabelsPublicSchema(BaseModel):
     labels: list[LabelPublicSchema]
+    next_cursor: str | None = None
 
 
 class LabelCreateSchema(BaseModel):
@@ -73,7 +74,10 @@ class TaskPublicSchema(BaseModel):
     id: int
     title: str
     description: str
-    status: TaskStates
+    status: Annotated[
+        TaskStates,
+        Field(validation_alias=AliasChoices('current_status', 'status')),
+    ]
     label: LabelPublicSchema | None = None
     expires_at: datetime
     updated_at: datetime
@@ -82,6 +86,19 @@ class TaskPublicSchema(BaseModel):
 
 class TasksPublicSchema(BaseModel):
     tasks: list[TaskPublicSchema]
+    next_cursor: str | None = None
+    total: int | None = None
+
+
+class TaskLabelCountSchema(BaseModel):
+    label_id: int | None
+    count: int
+
+
+class TaskStatsSchema(BaseModel):
+    total: int
+    by_status: dict[TaskStates, int]
+    by_label: list[TaskLabelCountSchema]
 
 
 class TaskCreateSchema(BaseModel):
@@ -97,3 +114,29 @@ class TaskUpdateSchema(BaseModel):
     description: Annotated[str | None, Field(max_length=255)] = None
     expires_at: Annotated[datetime | None, Field()] = None
     label_id: Annotated[int | None, Field(gt=0)] = None
+
+
+class TaskBulkUpdateSchema(TaskUpdateSchema):
+    id: Annotated[int, Field(gt=0)]
+
+
+class TaskBulkResultSchema(BaseModel):
+    index: int
+    id: int | None = None
+    status_code: int
+    detail: str | None = None
+
+
+class TasksBulkResultSchema(BaseModel):
+    results: list[TaskBulkResultSchema]
+
+
+class TaskImportErrorSchema(BaseModel):
+    line: int
+    detail: str
+
+
+class TasksImportResultSchema(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[TaskImportErrorSchema]
@@ -1,14 +1,79 @@
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Literal
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Literal
+from uuid import uuid4
 
 import jwt
 from pwdlib import PasswordHash
 
 from src.schemas import Token
-from src.settings import Settings
+from src.settings import Settings, get_settings
 
 pwd_context = PasswordHash.recommended()
 
+# The hash pool starts lazily inside a threaded server, where a forked worker
+# could inherit a lock held by another thread.
+POOL_START_METHOD = (
+    'forkserver'
+    if 'forkserver' in multiprocessing.get_all_start_methods()
+    else 'spawn'
+)
+
+
+@dataclass(frozen=True)
+class TokenKeys:
+    signing_key: Any
+    verifying_key: Any
+    algorithm: str
+    algorithms: list[str]
+    expires_delta: timedelta
+
+
+@lru_cache(maxsize=4)
+def build_token_keys(
+    settings: Settings, which_token: Literal['access_token', 'refresh_token']
+) -> TokenKeys:
+    if which_token == 'access_token':
+        raw_key = settings.ACCESS_TOKEN_KEY
+        expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+
+    elif which_token == 'refresh_token':
+        raw_key = settings.REFRESH_TOKEN_KEY
+        expire_minutes = settings.REFRESH_TOKEN_EXPIRE_MINUTES
+
+    signing_key = jwt.get_algorithm_by_name(
+        settings.TOKEN_ALGORITHM
+    ).prepare_key(raw_key)
+
+    # Asymmetric algorithms sign with the private key and verify with its
+    # public half; HMAC keys are used as is for both.
+    if hasattr(signing_key, 'public_key'):
+        verifying_key = signing_key.public_key()
+
+    else:
+        verifying_key = signing_key
+
+    return TokenKeys(
+        signing_key=signing_key,
+        verifying_key=verifying_key,
+        algorithm=settings.TOKEN_ALGORITHM,
+        algorithms=[settings.TOKEN_ALGORITHM],
+        expires_delta=timedelta(minutes=expire_minutes),
+    )
+
+
+def get_token_keys(
+    which_token: Literal['access_token', 'refresh_token'],
+) -> TokenKeys:
+    return build_token_keys(get_settings(), which_token)
+
 
 def get_password_hash(raw_password: str) -> str:
     return pwd_context.hash(raw_password)
@@ -18,24 +83,98 @@ def verify_password(raw_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(raw_password, hashed_password)
 
 
+class PasswordHashPoolFull(Exception):
+    """Raised when the password hash pool admits no more operations."""
+
+
+class PasswordHashPool:
+    """Bounded process pool for the CPU and memory heavy Argon2 calls.
+
+    At most ``workers + max_queue`` operations are admitted at once; past
+    that callers get ``PasswordHashPoolFull`` instead of queueing behind a
+    login spike.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                )
+
+            return self._executor
+
+    async def run(self, function: Callable, *args):
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                raise PasswordHashPoolFull
+
+            self.pending += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), function, *args
+            )
+
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hash_pool = PasswordHashPool(
+    workers=get_settings().PASSWORD_HASH_WORKERS,
+    max_queue=get_settings().PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def get_password_hash_pooled(raw_password: str) -> str:
+    return await password_hash_pool.run(get_password_hash, raw_password)
+
+
+async def verify_password_pooled(
+    raw_password: str, hashed_password: str
+) -> bool:
+    return await password_hash_pool.run(
+        verify_password, raw_password, hashed_password
+    )
+
+
 def create_token(
     which_token: Literal['access_token', 'refresh_token'], payload: dict = {}
 ) -> Token:
+    token_keys = get_token_keys(which_token)
     to_encode = payload.copy()
+    expire = (
+        datetime.now(timezone(timedelta(hours=-3))) + token_keys.expires_delta
+    )
 
-    if which_token == 'access_token':
-        key = Settings().ACCESS_TOKEN_KEY  # type:ignore
-        expire = datetime.now(timezone(timedelta(hours=-3))) + timedelta(
-            minutes=Settings().ACCESS_TOKEN_EXPIRE_MINUTES  # type:ignore
-        )
+    to_encode.update({'exp': expire.timestamp()})
 
-    elif which_token == 'refresh_token':
-        key = Settings().REFRESH_TOKEN_KEY  # type:ignore
-        expire = datetime.now(timezone(timedelta(hours=-3))) + timedelta(
-            minutes=Settings().REFRESH_TOKEN_EXPIRE_MINUTES  # type:ignore
-        )
+    # Refresh tokens are single use; their jti is what gets revoked.
+    if which_token == 'refresh_token':
+        to_encode.setdefault('jti', uuid4().hex)
 
-    to_encode.update({'exp': expire.timestamp()})
-    encoded_jwt = jwt.encode(to_encode, key, Settings().TOKEN_ALGORITHM)  # type:ignore
+    encoded_jwt = jwt.encode(
+        to_encode, token_keys.signing_key, token_keys.algorithm
+    )
 
     return Token(token=encoded_jwt, token_type='Bearer')
@@ -0,0 +1,245 @@
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime
+from functools import lru_cache
+from typing import TypedDict, get_args
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import Row
+
+from src.models import LabelModel, TaskModel, TaskStates
+
+
+class LabelRow(TypedDict):
+    id: int
+    title: str
+    color: str
+    priority: int
+    updated_at: datetime
+    created_at: datetime
+
+
+class TaskRow(TypedDict):
+    id: int
+    title: str
+    description: str | None
+    status: TaskStates
+    label: LabelRow | None
+    expires_at: datetime
+    updated_at: datetime
+    created_at: datetime
+
+
+class LabelsPage(TypedDict):
+    labels: list[LabelRow]
+    next_cursor: str | None
+
+
+class TasksPage(TypedDict):
+    tasks: list[TaskRow]
+    next_cursor: str | None
+    total: int | None
+
+
+# TypedDicts are serialized by pydantic-core without building a model per
+# row, and dump_json encodes straight to bytes in Rust.
+task_adapter = TypeAdapter(TaskRow)
+labels_page_adapter = TypeAdapter(LabelsPage)
+tasks_page_adapter = TypeAdapter(TasksPage)
+
+LABEL_COLUMNS = (
+    LabelModel.id,
+    LabelModel.title,
+    LabelModel.color,
+    LabelModel.priority,
+    LabelModel.updated_at,
+    LabelModel.created_at,
+)
+
+TASK_COLUMNS = (
+    TaskModel.id,
+    TaskModel.title,
+    TaskModel.description,
+    TaskModel.current_status,
+    TaskModel.expires_at,
+    TaskModel.updated_at,
+    TaskModel.created_at,
+    *LABEL_COLUMNS,
+)
+
+LABEL_FIELDS = tuple(LabelRow.__annotations__)
+TASK_FIELDS = tuple(TaskRow.__annotations__)
+LABEL_FIELD_COLUMNS = {
+    name: (column,) for name, column in zip(LABEL_FIELDS, LABEL_COLUMNS)
+}
+TASK_FIELD_COLUMNS = {
+    'id': (TaskModel.id,),
+    'title': (TaskModel.title,),
+    'description': (TaskModel.description,),
+    'status': (TaskModel.current_status,),
+    'label': LABEL_COLUMNS,
+    'expires_at': (TaskModel.expires_at,),
+    'updated_at': (TaskModel.updated_at,),
+    'created_at': (TaskModel.created_at,),
+}
+
+
+def sparse_columns(fields: Sequence[str], field_columns: dict) -> tuple:
+    return tuple(column for name in fields for column in field_columns[name])
+
+
+@lru_cache(maxsize=None)
+def sparse_page_adapter(
+    page: type, items: str, fields: tuple[str, ...]
+) -> TypeAdapter:
+    """Adapter for ``page`` with its items narrowed to ``fields``.
+
+    Field sets arrive in canonical order, so each one is built only once.
+    """
+    (row,) = get_args(page.__annotations__[items])
+    sparse_row = TypedDict(
+        f'{row.__name__}[{",".join(fields)}]',
+        {name: row.__annotations__[name] for name in fields},
+    )
+
+    return TypeAdapter(
+        TypedDict(
+            f'{page.__name__}[{",".join(fields)}]',
+            {**page.__annotations__, items: list[sparse_row]},
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def sparse_page_schema(
+    page: type[BaseModel], items: str, fields: tuple[str, ...]
+) -> type[BaseModel]:
+    """``page`` with its item schema narrowed to ``fields``."""
+    (item,) = get_args(page.model_fields[items].annotation)
+    sparse_item = create_model(
+        f'{item.__name__}[{",".join(fields)}]',
+        __config__=item.model_config,
+        **{
+            name: (item.model_fields[name].annotation, item.model_fields[name])
+            for name in fields
+        },
+    )
+
+    return create_model(
+        f'{page.__name__}[{",".join(fields)}]',
+        __base__=page,
+        **{items: (list[sparse_item], ...)},
+    )
+
+
+def sparse_page_response(
+    page_schema: type[BaseModel],
+    items: str,
+    fields: tuple[str, ...],
+    page: dict,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    schema = sparse_page_schema(page_schema, items, fields)
+
+    return Response(
+        content=schema.model_validate(page).model_dump_json(),
+        headers=headers,
+        media_type='application/json',
+    )
+
+
+def sparse_row(row: Sequence, fields: Sequence[str]) -> dict:
+    # Rows start with the id the cursor needs, then the fields' columns.
+    values, index = {}, 1
+
+    for name in fields:
+        if name == 'label':
+            values[name] = (
+                None
+                if row[index] is None
+                else label_row(row[index : index + len(LABEL_COLUMNS)])
+            )
+            index += len(LABEL_COLUMNS)
+
+        else:
+            values[name] = row[index]
+            index += 1
+
+    return values
+
+
+def label_row(row: Sequence) -> LabelRow:
+    return {
+        'id': row[0],
+        'title': row[1],
+        'color': row[2],
+        'priority': row[3],
+        'updated_at': row[4],
+        'created_at': row[5],
+    }
+
+
+def task_row(row: Sequence) -> TaskRow:
+    return {
+        'id': row[0],
+        'title': row[1],
+        'description': row[2],
+        'status': row[3],
+        'label': None if row[7] is None else label_row(row[7:13]),
+        'expires_at': row[4],
+        'updated_at': row[5],
+        'created_at': row[6],
+    }
+
+
+def labels_page_response(
+    rows: Iterable[Row],
+    cursor: str | None,
+    headers: Mapping[str, str] | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> Response:
+    if fields:
+        adapter = sparse_page_adapter(LabelsPage, 'labels', fields)
+        labels = [sparse_row(row, fields) for row in rows]
+
+    else:
+        adapter = labels_page_adapter
+        labels = [label_row(row) for row in rows]
+
+    return Response(
+        content=adapter.dump_json({'labels': labels, 'next_cursor': cursor}),
+        headers=headers,
+        media_type='application/json',
+    )
+
+
+def tasks_page_response(
+    rows: Iterable[Row],
+    cursor: str | None,
+    headers: Mapping[str, str] | None = None,
+    total: int | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> Response:
+    if fields:
+        adapter = sparse_page_adapter(TasksPage, 'tasks', fields)
+        tasks = [sparse_row(row, fields) for row in rows]
+
+    else:
+        adapter = tasks_page_adapter
+        tasks = [task_row(row) for row in rows]
+
+    return Response(
+        content=adapter.dump_json({
+            'tasks': tasks,
+            'next_cursor': cursor,
+            'total': total,
+        }),
+        headers=headers,
+        media_type='application/json',
+    )
+
+
+def task_lines(rows: Iterable[Row]) -> bytes:
+    return b''.join(
+        task_adapter.dump_json(task_row(row)) + b'\n' for row in rows
+    )
@@ -1,13 +1,58 @@
+from functools import lru_cache
+from typing import Annotated, Literal
+
+from pydantic import Field, PositiveFloat
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
-        env_file='.env', env_file_encoding='utf-8', extra='ignore'
+        env_file='.env', env_file_encoding='utf-8', extra='ignore', frozen=True
     )
     DATABASE_URL: str
+    DATABASE_MODE: Literal['sync', 'async'] = 'sync'
+    ASYNC_DATABASE_URL: str | None = None
+    READ_REPLICA_URLS: tuple[str, ...] = ()
+    REPLICA_EJECT_SECONDS: float = 30
+    READ_YOUR_WRITES_SECONDS: float = 5
+    READ_YOUR_WRITES_MAX_SIZE: int = 10_000
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    SQLITE_PRAGMA_PROFILE: Literal['none', 'safe', 'wal'] = 'wal'
+    SQLITE_MMAP_SIZE: int = 268_435_456
+    SQLITE_CACHE_SIZE: int = -64_000
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
     ACCESS_TOKEN_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_KEY: str
     REFRESH_TOKEN_EXPIRE_MINUTES: int
     TOKEN_ALGORITHM: str
+    EXPIRE_TASKS_INTERVAL_SECONDS: float = 60
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 60
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+    REVOCATION_FILTER_SIZE_BYTES: int = 1_048_576
+    REVOCATION_FILTER_ERROR_RATE: Annotated[float, Field(gt=0, lt=1)] = 0.001
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    LOGIN_ADDRESS_BURST: int = 20
+    LOGIN_ADDRESS_PER_SECOND: PositiveFloat = 1
+    LOGIN_USERNAME_BURST: int = 5
+    LOGIN_USERNAME_PER_SECOND: PositiveFloat = 0.1
+    LOGIN_BUCKETS_MAX_SIZE: int = 10_000
+    TASK_LABEL_LOADING: Literal['selectin', 'joined'] = 'selectin'
+    LIST_SERIALIZATION: Literal['rows', 'orm'] = 'rows'
+    SLOW_QUERY_THRESHOLD_MS: float = 100
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()  # type:ignore
+
+
+def reload_settings() -> Settings:
+    get_settings.cache_clear()
+
+    return get_settings()
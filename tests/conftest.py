@@ -0,0 +1,136 @@
+import os
+import tempfile
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Settings are read when src is imported, so the test database goes first.
+os.environ['DATABASE_URL'] = f'sqlite:///{tempfile.mkdtemp()}/test.sqlite'
+os.environ['DATABASE_MODE'] = 'sync'
+os.environ['READ_REPLICA_URLS'] = '[]'
+os.environ.setdefault('ACCESS_TOKEN_KEY', 'test-access-token-key')
+os.environ.setdefault('REFRESH_TOKEN_KEY', 'test-refresh-token-key')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('REFRESH_TOKEN_EXPIRE_MINUTES', '60')
+os.environ.setdefault('TOKEN_ALGORITHM', 'HS256')
+
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.dependencies import (  # noqa: E402
+    engine,
+    recent_writes,
+    token_cache,
+    user_cache,
+)
+from src.main import app  # noqa: E402
+from src.models import Base, UserModel, current_datetime  # noqa: E402
+from src.security import create_token  # noqa: E402
+from src.settings import reload_settings  # noqa: E402
+
+
+@contextmanager
+def count_statements(engine) -> Iterator[list[str]]:
+    statements: list[str] = []
+    target = getattr(engine, 'sync_engine', engine)
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(target, 'before_cursor_execute', before_cursor_execute)
+
+    try:
+        yield statements
+
+    finally:
+        event.remove(target, 'before_cursor_execute', before_cursor_execute)
+
+
+@contextmanager
+def assert_statement_count(engine, expected: int) -> Iterator[list[str]]:
+    """Fail if the block runs other than ``expected`` SQL statements.
+
+    Each executemany counts once. Wrap a single TestClient request to pin
+    the number of queries a route issues.
+    """
+    with count_statements(engine) as statements:
+        yield statements
+
+    assert len(statements) == expected, (
+        f'Expected {expected} SQL statements, got {len(statements)}:\n'
+        + '\n'.join(statements)
+    )
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    def override(**values):
+        for key, value in values.items():
+            monkeypatch.setenv(key, value)
+
+        return reload_settings()
+
+    yield override
+
+    monkeypatch.undo()
+    reload_settings()
+
+
+@pytest.fixture(scope='session')
+def migrated_engine():
+    # Migrate instead of create_all: the FTS index and the task counter
+    # triggers only exist in the migrations.
+    config = Config()
+    config.set_main_option(
+        'script_location', str(Path(__file__).parents[1] / 'migrations')
+    )
+    command.upgrade(config, 'head')
+
+    return getattr(engine, 'sync_engine', engine)
+
+
+@pytest.fixture
+def session(migrated_engine):
+    with Session(migrated_engine, expire_on_commit=False) as session:
+        yield session
+
+    # Deleting tasks fires the triggers that empty tasks_fts as well.
+    with migrated_engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def client(session):
+    with TestClient(app) as client:
+        yield client
+
+    user_cache.clear()
+    token_cache.clear()
+    recent_writes.clear()
+
+
+@pytest.fixture
+def user(session):
+    user = UserModel(
+        id=str(uuid.uuid4()),
+        username='test',
+        email='test@example.com',
+        password_hash='not-a-real-hash',
+        updated_at=current_datetime(),
+        created_at=current_datetime(),
+    )
+    session.add(user)
+    session.commit()
+
+    return user
+
+
+@pytest.fixture
+def token(user):
+    return create_token('access_token', {'sub': user.username}).token
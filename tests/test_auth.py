@@ -0,0 +1,37 @@
+from http import HTTPStatus
+
+from src.security import create_token
+
+
+def refresh(client, refresh_token):
+    return client.post(
+        '/auth/refresh-token',
+        headers={'Authorization': f'Bearer {refresh_token}'},
+    )
+
+
+def test_refresh_token_rotates_and_rejects_reuse(client, user):
+    refresh_token = create_token('refresh_token', {'sub': user.username})
+
+    response = refresh(client, refresh_token.token)
+
+    assert response.status_code == HTTPStatus.OK
+
+    reused = refresh(client, refresh_token.token)
+
+    assert reused.status_code == HTTPStatus.UNAUTHORIZED
+    assert reused.headers['WWW-Authenticate'] == 'Bearer'
+
+    rotated = refresh(client, response.json()['refresh_token']['token'])
+
+    assert rotated.status_code == HTTPStatus.OK
+
+
+def test_refresh_token_without_jti_is_rejected(client, user):
+    refresh_token = create_token(
+        'refresh_token', {'sub': user.username, 'jti': None}
+    )
+
+    response = refresh(client, refresh_token.token)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,151 @@
+import sqlite3
+import time
+from contextlib import closing
+from datetime import timedelta
+from http import HTTPStatus
+
+import jwt
+import pytest
+from fastapi import Request
+
+from src.dependencies import (
+    ReplicaSet,
+    create_database_engine,
+    engine,
+    pin_to_primary,
+    recent_writes,
+    token_cache,
+    use_replica,
+    verify_token,
+)
+from src.models import current_datetime
+from src.security import get_token_keys
+from src.settings import get_settings
+from tests.conftest import count_statements
+
+
+@pytest.fixture
+def replica_set(monkeypatch, tmp_path, user):
+    # A snapshot of the primary taken once the test user exists, followed
+    # by a replica whose file can never be opened.
+    replica_path = tmp_path / 'replica.sqlite'
+
+    with closing(sqlite3.connect(engine.url.database)) as primary:
+        with closing(sqlite3.connect(replica_path)) as replica:
+            primary.backup(replica)
+
+    replica_set = ReplicaSet(
+        [
+            create_database_engine(
+                get_settings(), f'sqlite:///{replica_path}'
+            ),
+            create_database_engine(
+                get_settings(), f'sqlite:///{tmp_path}/missing/replica.sqlite'
+            ),
+        ],
+        eject_seconds=60,
+    )
+    monkeypatch.setattr('src.dependencies.replicas', replica_set)
+
+    yield replica_set
+
+    recent_writes.clear()
+
+    for replica_engine in replica_set.engines:
+        replica_engine.dispose()
+
+
+def make_request(method: str, token: str | None = None) -> Request:
+    headers = []
+
+    if token:
+        headers.append((b'authorization', f'Bearer {token}'.encode()))
+
+    return Request({'type': 'http', 'method': method, 'headers': headers})
+
+
+@pytest.mark.usefixtures('replica_set')
+def test_use_replica_pins_writers_to_primary(token):
+    assert use_replica(make_request('GET', token))
+    assert not use_replica(make_request('POST', token))
+    assert not use_replica(make_request('GET', token))
+    assert use_replica(make_request('GET'))
+
+
+@pytest.mark.usefixtures('replica_set')
+def test_pin_to_primary_covers_tokens_issued_later(user, token):
+    pin_to_primary(user.username)
+
+    assert not use_replica(make_request('GET', token))
+
+
+def test_replicas_are_chosen_round_robin(replica_set):
+    assert [replica_set.choose() for _ in range(4)] == [0, 1, 0, 1]
+
+
+def test_dead_replica_is_ejected_and_reads_fall_back(
+    client, token, replica_set
+):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # The second read lands on the dead replica and is served by the
+    # primary instead; the third is back on the live replica.
+    for served_by_primary in [False, True, False]:
+        with count_statements(engine) as statements:
+            response = client.get('/task/all', headers=headers)
+
+        assert response.status_code == HTTPStatus.OK
+        assert bool(statements) == served_by_primary
+
+    assert [replica_set.choose() for _ in range(2)] == [0, 0]
+
+
+def test_writes_and_read_your_writes_stay_on_primary(
+    client, token, replica_set
+):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with count_statements(replica_set.engines[0]) as statements:
+        created = client.post(
+            '/task/',
+            json={
+                'title': 'task',
+                'expires_at': (
+                    current_datetime() + timedelta(days=1)
+                ).isoformat(),
+            },
+            headers=headers,
+        )
+        shown = client.get(f'/task/{created.json()["id"]}', headers=headers)
+
+    assert created.status_code == HTTPStatus.CREATED
+    assert shown.status_code == HTTPStatus.OK
+    assert statements == []
+
+    recent_writes.clear()
+
+    # Past the window reads go back to the replica, whose snapshot
+    # predates the task.
+    response = client.get(f'/task/{created.json()["id"]}', headers=headers)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_token_cache_entries_never_outlive_the_cache_ttl():
+    token_keys = get_token_keys('access_token')
+    token = jwt.encode(
+        {'sub': 'test', 'exp': time.time() + token_cache.ttl * 10},
+        token_keys.signing_key,
+        token_keys.algorithm,
+    )
+
+    token_cache.clear()
+
+    try:
+        verify_token(token, 'access_token')
+        ((deadline, _),) = token_cache._entries.values()
+
+        assert deadline <= time.monotonic() + token_cache.ttl
+
+    finally:
+        token_cache.clear()
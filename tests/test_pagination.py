@@ -0,0 +1,71 @@
+import json
+from base64 import urlsafe_b64encode
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from src.models import TaskModel
+from src.pagination import INT64_MAX, decode_cursor, encode_cursor
+
+
+def raw_cursor(payload) -> str:
+    return urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    'key',
+    [
+        ('id-asc', TaskModel.id, INT64_MAX),
+        ('title-desc', TaskModel.title, 'título "quoted"'),
+        ('expires_at-asc', TaskModel.expires_at, datetime(2026, 1, 2, 3, 4)),
+    ],
+)
+def test_cursor_round_trip(key):
+    order_by, column, value = key
+    cursor = encode_cursor(order_by, value, 42)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor, order_by, column) == (value, 42)
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    [
+        'not a cursor',
+        urlsafe_b64encode(b'not json').decode(),
+        raw_cursor(['id-asc', 1]),
+        raw_cursor(['title-asc', 1, 1]),
+        raw_cursor(['id-asc', 1, True]),
+        raw_cursor(['id-asc', 1, INT64_MAX + 1]),
+        raw_cursor(['id-asc', INT64_MAX + 1, 1]),
+        raw_cursor(['id-asc', '1', 1]),
+    ],
+)
+def test_decode_cursor_rejects_bad_cursors(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 'id-asc', TaskModel.id)
+
+    assert error.value.status_code == HTTPStatus.BAD_REQUEST
+    assert error.value.detail == 'Invalid cursor'
+
+
+def test_decode_cursor_rejects_bad_datetimes():
+    with pytest.raises(HTTPException):
+        decode_cursor(
+            raw_cursor(['expires_at-asc', 'yesterday', 1]),
+            'expires_at-asc',
+            TaskModel.expires_at,
+        )
+
+
+def test_show_all_tasks_rejects_a_bad_cursor(client, token):
+    response = client.get(
+        '/task/all',
+        params={'cursor': raw_cursor(['id-asc', 1, True])},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from freezegun import freeze_time
+
+from src.ratelimit import (
+    TokenBucketLimiter,
+    admit_login,
+    login_address_limiter,
+    login_succeeded,
+    login_username_limiter,
+)
+
+
+@pytest.fixture
+def login_limiters():
+    yield login_address_limiter, login_username_limiter
+
+    login_address_limiter.clear()
+    login_username_limiter.clear()
+
+
+def test_acquire_waits_for_the_next_token():
+    limiter = TokenBucketLimiter(burst=2, per_second=0.5, maxsize=10)
+
+    with freeze_time('2026-01-01 00:00:00'):
+        assert limiter.acquire('key') == 0
+        assert limiter.acquire('key') == 0
+        assert limiter.acquire('key') == pytest.approx(2)
+
+
+def test_idle_buckets_are_evicted_once_surely_full():
+    limiter = TokenBucketLimiter(burst=2, per_second=1, maxsize=10)
+
+    with freeze_time('2026-01-01 00:00:00') as frozen:
+        limiter.acquire('drained')
+        limiter.acquire('drained')
+        frozen.tick(1)
+        limiter.acquire('idle')
+        frozen.tick(1.5)
+        limiter.acquire('other')
+
+        assert list(limiter._buckets) == ['idle', 'other']
+
+        frozen.tick(1)
+        limiter.acquire('other')
+
+        assert list(limiter._buckets) == ['other']
+
+
+def test_refund_gives_back_the_token():
+    limiter = TokenBucketLimiter(burst=1, per_second=0.01, maxsize=10)
+
+    limiter.acquire('key')
+    limiter.refund('key')
+
+    assert limiter.acquire('key') == 0
+
+
+def test_successful_logins_do_not_spend_the_username_bucket(login_limiters):
+    _, username_limiter = login_limiters
+
+    for _ in range(username_limiter.burst * 2):
+        admit_login('test', '127.0.0.1')
+        login_succeeded('test')
+
+    admit_login('test', '127.0.0.1')
+
+
+def test_failed_logins_spend_the_username_bucket(login_limiters):
+    _, username_limiter = login_limiters
+
+    for _ in range(username_limiter.burst):
+        admit_login('test', None)
+
+    with pytest.raises(HTTPException) as error:
+        admit_login('test', None)
+
+    assert error.value.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert 'Retry-After' in error.value.headers
+
+
+def test_clients_without_address_share_no_address_bucket(login_limiters):
+    address_limiter, _ = login_limiters
+
+    for index in range(address_limiter.burst * 2):
+        admit_login(f'user-{index}', None)
+
+    assert len(address_limiter) == 0
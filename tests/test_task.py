@@ -0,0 +1,536 @@
+import json
+import uuid
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import func, select
+
+from src.dependencies import engine
+from src.importers import CSV_MAX_RECORD_LENGTH
+from src.models import (
+    LabelModel,
+    TaskCounterModel,
+    TaskModel,
+    TaskStates,
+    UserModel,
+    current_datetime,
+)
+from tests.conftest import assert_statement_count
+
+PAGE_SIZE = 5
+
+# (LIST_SERIALIZATION, TASK_LABEL_LOADING, statements for a first page).
+# Every count includes the user lookup behind the access token and the
+# ETag validator. The rows serializer joins labels into the page query,
+# the ORM one adds a select-in query unless labels are joined.
+LIST_STRATEGIES = [
+    ('rows', 'selectin', 3),
+    ('rows', 'joined', 3),
+    ('orm', 'selectin', 4),
+    ('orm', 'joined', 3),
+]
+
+
+@pytest.fixture
+def tasks(session, user):
+    now = current_datetime()
+    labels = [
+        LabelModel(
+            title=f'label {index}',
+            color='#ffffff',
+            priority=index,
+            user_id=user.id,
+            updated_at=now,
+            created_at=now,
+        )
+        for index in range(2)
+    ]
+    tasks = [
+        TaskModel(
+            title=f'task {index}',
+            description='',
+            status=TaskStates.PENDING,
+            expires_at=now + timedelta(days=1),
+            label=labels[index % 2],
+            user_id=user.id,
+            updated_at=now,
+            created_at=now,
+        )
+        for index in range(PAGE_SIZE * 2)
+    ]
+    session.add_all(tasks)
+    session.commit()
+
+    return tasks
+
+
+@pytest.fixture
+def other_task(session):
+    now = current_datetime()
+    user = UserModel(
+        id=str(uuid.uuid4()),
+        username='other',
+        email='other@example.com',
+        password_hash='not-a-real-hash',
+        updated_at=now,
+        created_at=now,
+    )
+    session.add(user)
+    session.commit()
+
+    task = TaskModel(
+        title='other task',
+        description='',
+        status=TaskStates.PENDING,
+        expires_at=now + timedelta(days=1),
+        label=LabelModel(
+            title='other label',
+            color='#ffffff',
+            priority=0,
+            user_id=user.id,
+            updated_at=now,
+            created_at=now,
+        ),
+        user_id=user.id,
+        updated_at=now,
+        created_at=now,
+    )
+    session.add(task)
+    session.commit()
+
+    return task
+
+
+@pytest.mark.parametrize('strategy', LIST_STRATEGIES)
+def test_show_all_tasks_statement_count(
+    client, settings, token, tasks, strategy
+):
+    serialization, loading, expected = strategy
+    settings(LIST_SERIALIZATION=serialization, TASK_LABEL_LOADING=loading)
+
+    with assert_statement_count(engine, expected):
+        response = client.get(
+            '/task/all',
+            params={'page_size': PAGE_SIZE},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json()['tasks']) == PAGE_SIZE
+    assert all(task['label'] for task in response.json()['tasks'])
+
+
+@pytest.mark.parametrize('strategy', LIST_STRATEGIES)
+def test_show_all_tasks_next_page_statement_count(
+    client, settings, token, tasks, strategy
+):
+    serialization, loading, expected = strategy
+    settings(LIST_SERIALIZATION=serialization, TASK_LABEL_LOADING=loading)
+    headers = {'Authorization': f'Bearer {token}'}
+    cursor = client.get(
+        '/task/all', params={'page_size': PAGE_SIZE}, headers=headers
+    ).json()['next_cursor']
+
+    # The first page cached the user, so a cursor page costs one less.
+    with assert_statement_count(engine, expected - 1):
+        response = client.get(
+            '/task/all',
+            params={'page_size': PAGE_SIZE, 'cursor': cursor},
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [task['id'] for task in response.json()['tasks']] == [
+        task.id for task in tasks[PAGE_SIZE:]
+    ]
+
+
+@pytest.mark.parametrize('strategy', [('selectin', 4), ('joined', 3)])
+def test_show_task_statement_count(client, settings, token, tasks, strategy):
+    loading, expected = strategy
+    settings(TASK_LABEL_LOADING=loading)
+
+    with assert_statement_count(engine, expected):
+        response = client.get(
+            f'/task/{tasks[0].id}',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['label']['id'] == tasks[0].label_id
+
+
+def test_show_all_tasks_not_modified_skips_the_page(client, token, tasks):
+    headers = {'Authorization': f'Bearer {token}'}
+    etag = client.get('/task/all', headers=headers).headers['ETag']
+
+    # The user is cached by now, which leaves the validator alone.
+    with assert_statement_count(engine, 1):
+        response = client.get(
+            '/task/all', headers={**headers, 'If-None-Match': etag}
+        )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['ETag'] == etag
+
+
+@pytest.mark.parametrize('search', [' ', '\t\n', 'a\x00b', 'rep\x7fort'])
+def test_search_tasks_rejects_blank_and_control_characters(
+    client, token, search
+):
+    response = client.get(
+        '/task/search',
+        params={'q': search},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {'detail': 'Invalid search query'}
+
+
+@pytest.mark.parametrize('strategy', [('selectin', 5), ('joined', 4)])
+def test_update_task_statement_count(client, settings, token, tasks, strategy):
+    loading, expected = strategy
+    settings(TASK_LABEL_LOADING=loading)
+
+    # User, task lookup and update, then the task reloaded with its label.
+    with assert_statement_count(engine, expected):
+        response = client.patch(
+            f'/task/{tasks[0].id}',
+            json={'title': 'updated'},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['label']['id'] == tasks[0].label_id
+
+
+def test_create_tasks_reports_each_item(client, token, tasks, other_task):
+    expires_at = (current_datetime() + timedelta(days=1)).isoformat()
+    response = client.post(
+        '/task/bulk',
+        json=[
+            {
+                'title': 'a',
+                'expires_at': expires_at,
+                'label_id': tasks[0].label_id,
+            },
+            {
+                'title': 'b',
+                'expires_at': (
+                    current_datetime() - timedelta(days=1)
+                ).isoformat(),
+            },
+            {
+                'title': 'c',
+                'expires_at': expires_at,
+                'label_id': other_task.label_id,
+            },
+            {'title': 'd', 'expires_at': expires_at},
+        ],
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    results = response.json()['results']
+
+    assert response.status_code == HTTPStatus.OK
+    assert [result['status_code'] for result in results] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.CREATED,
+    ]
+    assert results[0]['id'] < results[3]['id']
+
+
+def test_update_tasks_reports_each_item(
+    client, session, token, tasks, other_task
+):
+    response = client.patch(
+        '/task/bulk',
+        json=[
+            {'id': tasks[0].id, 'title': 'updated'},
+            {'id': other_task.id, 'title': 'updated'},
+            {'id': tasks[1].id, 'title': None},
+            {
+                'id': tasks[2].id,
+                'expires_at': (
+                    current_datetime() - timedelta(days=1)
+                ).isoformat(),
+            },
+            {'id': tasks[3].id, 'label_id': other_task.label_id},
+        ],
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [
+        result['status_code'] for result in response.json()['results']
+    ] == [
+        HTTPStatus.OK,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.NOT_FOUND,
+    ]
+
+    session.expire_all()
+
+    assert session.get(TaskModel, tasks[0].id).title == 'updated'
+    assert session.get(TaskModel, other_task.id).title == 'other task'
+    assert session.get(TaskModel, tasks[3].id).label_id == tasks[3].label_id
+
+
+def test_delete_tasks_reports_each_item(
+    client, session, token, tasks, other_task
+):
+    task_id, other_task_id = tasks[0].id, other_task.id
+    response = client.request(
+        'DELETE',
+        '/task/bulk',
+        json=[task_id, task_id, other_task_id, tasks[-1].id + 100],
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [
+        result['status_code'] for result in response.json()['results']
+    ] == [
+        HTTPStatus.OK,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.NOT_FOUND,
+    ]
+
+    session.expire_all()
+
+    assert session.get(TaskModel, task_id) is None
+    assert session.get(TaskModel, other_task_id) is not None
+
+
+def test_search_tasks_ranks_the_best_matches_first(
+    client, session, token, user
+):
+    now = current_datetime()
+    titles = [
+        'report on the quarterly planning meeting and its follow ups',
+        'groceries',
+        'report report',
+    ]
+    session.add_all(
+        TaskModel(
+            title=title,
+            description='',
+            status=TaskStates.PENDING,
+            expires_at=now + timedelta(days=1),
+            user_id=user.id,
+            updated_at=now,
+            created_at=now,
+        )
+        for title in titles
+    )
+    session.commit()
+
+    response = client.get(
+        '/task/search',
+        params={'q': 'report'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [task['title'] for task in response.json()['tasks']] == [
+        titles[2],
+        titles[0],
+    ]
+
+
+def test_search_tasks_cursor_walks_every_match_once(
+    client, token, tasks, other_task
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    params = {'q': 'task', 'page_size': 3}
+    found = []
+
+    # Every title scores the same, so pages are ordered by the id tiebreak.
+    while True:
+        page = client.get('/task/search', params=params, headers=headers)
+
+        assert page.status_code == HTTPStatus.OK
+
+        found += [task['id'] for task in page.json()['tasks']]
+
+        if not page.json()['next_cursor']:
+            break
+
+        params['cursor'] = page.json()['next_cursor']
+
+    assert found == [task.id for task in tasks]
+
+
+def import_tasks(client, token, file_format, lines):
+    return client.post(
+        '/task/import',
+        params={'format': file_format},
+        content='\n'.join(lines),
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+
+def test_import_ndjson_rejects_only_the_bad_line(client, token):
+    expires_at = (current_datetime() + timedelta(days=1)).isoformat()
+    response = import_tasks(
+        client,
+        token,
+        'ndjson',
+        [
+            json.dumps({'title': 'a', 'expires_at': expires_at}),
+            '{"title": "b",',
+            json.dumps({'title': 'c', 'expires_at': expires_at}),
+        ],
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'accepted': 2,
+        'rejected': 1,
+        'errors': [{'line': 2, 'detail': 'Invalid JSON'}],
+    }
+
+
+def test_import_csv_rejects_only_the_bad_line(client, token):
+    expires_at = (current_datetime() + timedelta(days=1)).isoformat()
+    response = import_tasks(
+        client,
+        token,
+        'csv',
+        [
+            'title,expires_at',
+            f'a,{expires_at}',
+            'b',
+            '"c',
+            f'd",{expires_at}',
+            f'e,{expires_at}',
+        ],
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'accepted': 3,
+        'rejected': 1,
+        'errors': [{'line': 3, 'detail': 'Expected 2 columns'}],
+    }
+
+
+def test_import_csv_caps_a_record_opened_by_a_stray_quote(client, token):
+    expires_at = (current_datetime() + timedelta(days=1)).isoformat()
+    line = f'a,{expires_at}'
+    lines_past_the_cap = CSV_MAX_RECORD_LENGTH // len(line) * 2
+    response = import_tasks(
+        client,
+        token,
+        'csv',
+        ['title,expires_at', f'"a,{expires_at}'] + [line] * lines_past_the_cap,
+    )
+
+    # The stray quote swallows lines up to the cap, then parsing resumes.
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['rejected'] == 1
+    assert response.json()['accepted'] > 0
+    assert response.json()['errors'] == [
+        {
+            'line': 2,
+            'detail': f'Record exceeds {CSV_MAX_RECORD_LENGTH} characters',
+        }
+    ]
+
+
+def assert_counters_match_tasks(session):
+    # End the read transaction, or the snapshot hides the app's writes.
+    session.rollback()
+    label_id = func.coalesce(TaskModel.label_id, 0)
+    expected = session.execute(
+        select(TaskModel.user_id, TaskModel.status, label_id, func.count())
+        .group_by(TaskModel.user_id, TaskModel.status, label_id)
+        .order_by(TaskModel.user_id, TaskModel.status, label_id)
+    ).all()
+    counted = session.execute(
+        select(
+            TaskCounterModel.user_id,
+            TaskCounterModel.status,
+            TaskCounterModel.label_id,
+            TaskCounterModel.count,
+        )
+        .where(TaskCounterModel.count > 0)
+        .order_by(
+            TaskCounterModel.user_id,
+            TaskCounterModel.status,
+            TaskCounterModel.label_id,
+        )
+    ).all()
+
+    assert counted == expected
+
+
+def test_task_counters_follow_bulk_writes_imports_and_label_deletes(
+    client, session, token, tasks, other_task
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    expires_at = (current_datetime() + timedelta(days=1)).isoformat()
+    label_id = tasks[0].label_id
+    assert_counters_match_tasks(session)
+
+    client.post(
+        '/task/bulk',
+        json=[
+            {'title': 'a', 'expires_at': expires_at, 'label_id': label_id},
+            {'title': 'b', 'expires_at': expires_at},
+        ],
+        headers=headers,
+    )
+    assert_counters_match_tasks(session)
+
+    client.patch(
+        '/task/bulk',
+        json=[
+            {'id': tasks[0].id, 'status': TaskStates.DONE.value},
+            {'id': tasks[1].id, 'label_id': label_id},
+            {'id': tasks[2].id, 'label_id': None},
+        ],
+        headers=headers,
+    )
+    assert_counters_match_tasks(session)
+
+    client.request(
+        'DELETE',
+        '/task/bulk',
+        json=[tasks[3].id, tasks[4].id],
+        headers=headers,
+    )
+    assert_counters_match_tasks(session)
+
+    import_tasks(
+        client,
+        token,
+        'ndjson',
+        [
+            json.dumps({'title': 'c', 'expires_at': expires_at}),
+            json.dumps({
+                'title': 'd',
+                'expires_at': expires_at,
+                'label_id': label_id,
+            }),
+        ],
+    )
+    assert_counters_match_tasks(session)
+
+    response = client.delete(f'/label/{label_id}', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert_counters_match_tasks(session)
+
+    # Two created, two deleted and two imported; the label's tasks stay.
+    stats = client.get('/task/stats', headers=headers).json()
+
+    assert stats['total'] == len(tasks) + 2
+    assert stats['by_status'][TaskStates.DONE] == 1
+    assert label_id not in {row['label_id'] for row in stats['by_label']}